@@ -1,13 +1,71 @@
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from the .env next to this file (no directory search),
+# and check the token before paying for the discord import
+load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'))
+
+# Get token from environment variable
+TOKEN = os.getenv('BOT_TOKEN')
+
+if not TOKEN:
+    print("❌ ERROR: BOT_TOKEN not found in environment variables!")
+    print("Make sure you have a .env file with BOT_TOKEN=your_token_here")
+    exit(1)
+
+print("✅ Bot token loaded successfully")
+
 import discord
 from discord.ext import commands, tasks
 import random
 import asyncio
-import os
+import copy
+import heapq
+import sys
 import time
+import functools
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from collections import Counter, deque
+from dataclasses import dataclass, field
 from datetime import datetime
-from dotenv import load_dotenv
+from types import MappingProxyType
+from typing import Final, Mapping
+
+class FastRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that tracks file size in memory instead of seeking on every record."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        try:
+            self._bytes_written = os.path.getsize(self.baseFilename)
+        except OSError:
+            self._bytes_written = 0
+    
+    def shouldRollover(self, record):
+        """Roll over once the tracked size reaches maxBytes."""
+        return self.maxBytes > 0 and self._bytes_written >= self.maxBytes
+    
+    def doRollover(self):
+        super().doRollover()
+        self._bytes_written = 0
+    
+    def emit(self, record):
+        """Write the record and add its encoded size to the running total."""
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record)
+            self.stream.write(msg + self.terminator)
+            self.flush()
+            self._bytes_written += len(msg.encode(self.encoding or 'utf-8')) + len(self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
 
 # Configure comprehensive logging system
 def setup_logging():
@@ -24,7 +82,7 @@ def setup_logging():
     logger.handlers.clear()
     
     # File handler with rotation (10MB files, keep 5 backups)
-    file_handler = RotatingFileHandler(
+    file_handler = FastRotatingFileHandler(
         'logs/coup_bot.log',
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5,
@@ -37,7 +95,7 @@ def setup_logging():
     console_handler.setLevel(logging.INFO)
     
     # Error file handler for errors only
-    error_handler = RotatingFileHandler(
+    error_handler = FastRotatingFileHandler(
         'logs/coup_bot_errors.log',
         maxBytes=5*1024*1024,  # 5MB
         backupCount=3,
@@ -62,16 +120,38 @@ def setup_logging():
     console_handler.setFormatter(console_formatter)
     error_handler.setFormatter(file_formatter)
     
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    logger.addHandler(error_handler)
+    # Route records through a queue so file/console I/O runs on the listener
+    # thread instead of blocking the event loop
+    log_queue = queue.Queue(maxsize=10000)
+    logger.addHandler(QueueHandler(log_queue))
+    
+    listener = QueueListener(
+        log_queue,
+        file_handler,
+        console_handler,
+        error_handler,
+        respect_handler_level=True
+    )
+    listener.start()
+    
+    # Keep a reference so shutdown can flush and stop the listener
+    logger._listener = listener
     
     return logger
 
 # Initialize logging
 logger = setup_logging()
 
+# Strong references to fire-and-forget tasks so they aren't garbage collected mid-flight
+_BG_TASKS = set()
+
+def spawn(coro):
+    """Run a coroutine as a background task that is kept alive until it finishes."""
+    task = asyncio.create_task(coro)
+    _BG_TASKS.add(task)
+    task.add_done_callback(_BG_TASKS.discard)
+    return task
+
 # Bot setup
 intents = discord.Intents.default()
 intents.message_content = True
@@ -79,58 +159,166 @@ intents.reactions = True
 intents.members = True
 bot = commands.Bot(command_prefix="!", intents=intents, help_command=None)
 
+# The five character cards; the court deck holds three of each
+CARDS = ("Duke", "Assassin", "Contessa", "Captain", "Ambassador")
+_FRESH_DECK = CARDS * 3  # Three of each character; copied into a new list per game
+
+# Beat between linked game messages so the channel reads in order without stalling the turn
+DRAMATIC_PAUSE = 0.25  # Seconds
+
 # Game variables - Now stored per guild (server) with activity tracking
-games = {}  # {guild_id: game_state} - Each server gets its own game
+@dataclass(slots=True)
+class PlayerState:
+    """One seat in a game: who sits there, their hidden hand and coin purse."""
+    member: object = None  # The discord.Member; players is keyed by member.id
+    cards: list = field(default_factory=list)
+    coins: int = 2
+    in_guild: bool = True  # Cleared by on_member_remove if the player leaves the server
+
+@dataclass(slots=True)
+class GameStats:
+    """Per-guild game statistics."""
+    games_started: int = 0
+    games_completed: int = 0
+    games_abandoned: int = 0
+    player_games: dict = field(default_factory=dict)  # {player_id: games_played}
+    player_wins: dict = field(default_factory=dict)   # {player_id: games_won}
+    total_participants: set = field(default_factory=set)  # unique players who have played
+
+@dataclass(slots=True)
+class GameState:
+    """All state for one guild's game. Mutate only while holding `lock`."""
+    players: dict = field(default_factory=dict)  # {member_id: PlayerState}
+    court_deck: list = field(default_factory=lambda: list(_FRESH_DECK))
+    discarded_cards: list = field(default_factory=list)
+    game_started: bool = False
+    current_player: object = None
+    join_message: object = None
+    last_activity: float = field(default_factory=time.time)
+    created_at: float = field(default_factory=time.time)
+    game_history: list = field(default_factory=list)
+    # Fixed seating order for the current game plus the index of whose turn it is
+    turn_order: list = field(default_factory=list)
+    turn_index: int = 0
+    alive: dict = field(default_factory=dict)  # {player_id: still has influence}
+    alive_count: int = 0  # Number of True entries in alive, kept in step with it
+    # NEW: Add basic statistics tracking
+    stats: GameStats = field(default_factory=GameStats)
+    # Per-guild RNG for deck, seating and exchange shuffles
+    rng: random.Random = field(default_factory=random.Random)
+    # Expiry time of this game's live entry in expiry_heap (None while unscheduled)
+    scheduled_expiry: float = None
+    # Serializes game commands so concurrent invocations can't interleave mutations
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+class GameRegistry(dict):
+    """{guild_id: GameState}; looking up a guild with no game creates one."""
+    
+    def __missing__(self, guild_id):
+        game_state = self[guild_id] = GameState()
+        # Shuffle the deck for new games
+        game_state.rng.shuffle(game_state.court_deck)
+        if __debug__:
+            logger.debug(f"✅ Created new game state for guild {guild_id}")
+        
+        # The cleanup task only runs while there are games to clean up
+        task = cleanup_inactive_games.get_task()
+        if task is None or task.done():
+            cleanup_inactive_games.start()
+        elif task.cancelling():
+            cleanup_inactive_games.restart()  # Going dormant was requested but hasn't happened yet
+        return game_state
+
+games = GameRegistry()  # Each server gets its own game
+
+# Cleanup thresholds
+INACTIVE_THRESHOLD = 2 * 60 * 60  # 2 hours in seconds
+ABANDONED_THRESHOLD = 24 * 60 * 60  # 24 hours for completely abandoned games
+
+# Min-heap of (expiry_time, guild_id) so cleanup only visits games that may have expired.
+# Entries whose expiry no longer matches the game's scheduled_expiry are stale and skipped.
+expiry_heap = []
+
+def game_expiry(game_state):
+    """Earliest time at which a game becomes eligible for cleanup."""
+    expiry = game_state.last_activity + INACTIVE_THRESHOLD
+    if not game_state.game_started:
+        expiry = min(expiry, game_state.created_at + ABANDONED_THRESHOLD)
+    return expiry
+
+def schedule_expiry(guild_id, game_state):
+    """Push a heap entry for a game that doesn't already have one."""
+    if game_state.scheduled_expiry is None:
+        game_state.scheduled_expiry = game_expiry(game_state)
+        heapq.heappush(expiry_heap, (game_state.scheduled_expiry, guild_id))
 
 def get_game_state(guild_id):
     """Get or create game state for a specific guild."""
-    if guild_id not in games:
-        games[guild_id] = {
-            'players': {},
-            'court_deck': ["Duke", "Assassin", "Contessa", "Captain", "Ambassador"] * 3,
-            'discarded_cards': [],
-            'game_started': False,
-            'current_player': None,
-            'join_message': None,
-            'last_activity': time.time(),
-            'created_at': time.time(),
-            # NEW: Add basic statistics tracking
-            'stats': {
-                'games_started': 0,
-                'games_completed': 0,
-                'games_abandoned': 0,
-                'player_games': {},  # {player_id: games_played}
-                'player_wins': {},   # {player_id: games_won}
-                'total_participants': set()  # unique players who have played
-            }
-        }
-        # Shuffle the deck for new games
-        random.shuffle(games[guild_id]['court_deck'])
-        print(f"✅ Created new game state for guild {guild_id}")
+    game_state = games[guild_id]  # GameRegistry.__missing__ creates it on first use
     
     # NEW: Update last activity whenever game state is accessed
-    games[guild_id]['last_activity'] = time.time()
-    return games[guild_id]
+    game_state.last_activity = time.time()
+    schedule_expiry(guild_id, game_state)
+    return game_state
+
+def get_lock(guild_id):
+    """Get the lock guarding a guild's game state."""
+    return get_game_state(guild_id).lock
+
+class GameReplaced(Exception):
+    """A paused command's game was swapped out by !end while it waited on players."""
+
+def ensure_current_game(ctx, game_state):
+    """Stop the running command (via GameReplaced) if !end replaced its game during an await."""
+    if games.get(ctx.guild.id) is not game_state:
+        raise GameReplaced
+
+def guild_locked(func):
+    """Run a command while holding the invoking guild's game lock."""
+    @functools.wraps(func)
+    async def wrapper(ctx, *args, **kwargs):
+        async with get_lock(ctx.guild.id):
+            try:
+                return await func(ctx, *args, **kwargs)
+            except GameReplaced:
+                logger.info(f"[{ctx.guild.name}] GAME_REPLACED: Dropped !{ctx.command} after the game was ended")
+    return wrapper
 
 def update_game_activity(guild_id):
     """Update the last activity time for a game."""
     if guild_id in games:
-        games[guild_id]['last_activity'] = time.time()
+        games[guild_id].last_activity = time.time()
+
+# Guild names are stable, so cache them instead of resolving on every move
+_GUILD_NAME_CACHE: dict[int, str] = {}
+
+def _guild_name(guild_id):
+    """Return the cached name for a guild, resolving it on first use."""
+    name = _GUILD_NAME_CACHE.get(guild_id)
+    if name:
+        return name
+    guild = bot.get_guild(guild_id)
+    if guild is None:
+        return "Unknown"  # Not cached yet: don't store the fallback, retry next time
+    name = _GUILD_NAME_CACHE[guild_id] = guild.name
+    return name
+
+@functools.lru_cache(maxsize=32)
+def _action_label(action_type):
+    """Upper-cased action label for log lines."""
+    return action_type.upper()
 
 def log_game_action(action_type, guild_id, player, target=None, details=None, success=True):
     """Log game actions with structured information."""
-    guild_name = "Unknown"
-    if guild := bot.get_guild(guild_id):
-        guild_name = guild.name
+    guild_name = _guild_name(guild_id)
     
     # Build log message with None checking
     player_name = getattr(player, 'name', 'Unknown Player') if player else 'Unknown Player'
     
     if target:
-        target_name = getattr(target, 'name', 'Unknown Player') if target else 'Unknown Player'
-        action_msg = f"{action_type.upper()}: {player_name} → {target_name}"
+        action_msg = f"{_action_label(action_type)}: {player_name} → {target.name}"
     else:
-        action_msg = f"{action_type.upper()}: {player_name}"
+        action_msg = f"{_action_label(action_type)}: {player_name}"
     
     if details:
         action_msg += f" | {details}"
@@ -140,107 +328,177 @@ def log_game_action(action_type, guild_id, player, target=None, details=None, su
     # Log at appropriate level
     if success:
         if action_type in ['challenge', 'block_challenge', 'assassination', 'coup']:
+            flush_action_buffer()  # Keep earlier actions ahead of this one in the log
             logger.warning(log_msg)  # Important dramatic actions
         else:
-            logger.info(log_msg)  # Regular actions
+            buffer_action(log_msg)  # Regular actions
     else:
+        flush_action_buffer()
         logger.warning(f"FAILED - {log_msg}")
 
-def record_game_start(guild_id, players):
+# Regular actions are buffered and written as one log record, a moment after the first one lands
+ACTION_FLUSH_DELAY = 0.25
+ACTION_BATCH_SIZE = 100
+_ACTION_BUFFER = []
+_action_flush_handle = None
+
+def buffer_action(log_msg):
+    """Queue a regular action for the next batched log record."""
+    global _action_flush_handle
+    _ACTION_BUFFER.append(log_msg)
+    if len(_ACTION_BUFFER) >= ACTION_BATCH_SIZE:
+        flush_action_buffer()
+    elif _action_flush_handle is None:
+        try:
+            _action_flush_handle = asyncio.get_running_loop().call_later(ACTION_FLUSH_DELAY, flush_action_buffer)
+        except RuntimeError:
+            # No event loop (startup/shutdown) - nothing will come back to flush, so write it now
+            flush_action_buffer()
+
+def flush_action_buffer():
+    """Log all buffered regular actions as a single record."""
+    global _action_flush_handle
+    if _action_flush_handle is not None:
+        _action_flush_handle.cancel()
+        _action_flush_handle = None
+    if _ACTION_BUFFER:
+        logger.info("\n".join(_ACTION_BUFFER))
+        _ACTION_BUFFER.clear()
+
+# Stats events are buffered and written as one log record per flush_stats tick
+_STATS_BUFFER = deque(maxlen=10000)
+
+def flush_stats_buffer():
+    """Log all buffered stats events as a single batch."""
+    if _STATS_BUFFER:
+        logger.info("STATS_BATCH:\n" + "\n".join(_STATS_BUFFER))
+        _STATS_BUFFER.clear()
+
+@tasks.loop(seconds=30)
+async def flush_stats():
+    """Periodically write out buffered stats events."""
+    flush_stats_buffer()
+
+def record_game_start(guild_id, players, game_state=None):
     """Record when a game starts."""
-    game_state = get_game_state(guild_id)
-    game_state['stats']['games_started'] += 1
+    if game_state is None:
+        game_state = get_game_state(guild_id)
+    game_state.stats.games_started += 1
     
     # Track player participation
     for player in players:
         player_id = player.id
-        game_state['stats']['total_participants'].add(player_id)
-        game_state['stats']['player_games'][player_id] = game_state['stats']['player_games'].get(player_id, 0) + 1
+        game_state.stats.total_participants.add(player_id)
+        game_state.stats.player_games[player_id] = game_state.stats.player_games.get(player_id, 0) + 1
     
-    logger.info(f"STATS: [{guild_id}] Game started with {len(players)} players")
+    _STATS_BUFFER.append(f"STATS: [{guild_id}] Game started with {len(players)} players")
 
-def record_game_end(guild_id, winner):
+def record_game_end(guild_id, winner, game_state=None):
     """Record when a game ends with a winner."""
-    game_state = get_game_state(guild_id)
-    game_state['stats']['games_completed'] += 1
+    if game_state is None:
+        game_state = get_game_state(guild_id)
+    game_state.stats.games_completed += 1
     
     # Track winner
     winner_id = winner.id
-    game_state['stats']['player_wins'][winner_id] = game_state['stats']['player_wins'].get(winner_id, 0) + 1
+    game_state.stats.player_wins[winner_id] = game_state.stats.player_wins.get(winner_id, 0) + 1
     
-    logger.info(f"STATS: [{guild_id}] Game completed, winner: {winner.name}")
+    _STATS_BUFFER.append(f"STATS: [{guild_id}] Game completed, winner: {winner.name}")
 
-def record_game_abandoned(guild_id):
+def record_game_abandoned(guild_id, game_state=None):
     """Record when a game is abandoned."""
-    game_state = get_game_state(guild_id)
-    if game_state['game_started']:  # Only count as abandoned if it actually started
-        game_state['stats']['games_abandoned'] += 1
-        logger.info(f"STATS: [{guild_id}] Game abandoned")
+    if game_state is None:
+        game_state = get_game_state(guild_id)
+    if game_state.game_started:  # Only count as abandoned if it actually started
+        game_state.stats.games_abandoned += 1
+        _STATS_BUFFER.append(f"STATS: [{guild_id}] Game abandoned")
+
+async def notify_guild_cleanup(guild_id, reason):
+    """Tell a guild its game was cleaned up, in the first channel we can post to."""
+    try:
+        guild = bot.get_guild(guild_id)
+        if guild:
+            # Find a general channel to send cleanup notification
+            for channel in guild.text_channels:
+                if channel.permissions_for(guild.me).send_messages:
+                    embed = discord.Embed(
+                        title="🧹 Game Cleanup",
+                        description=f"The Coup game in this server was automatically cleaned up due to inactivity.\n\nReason: {reason}",
+                        color=discord.Color.orange()
+                    )
+                    embed.set_footer(text="Use !start to begin a new game")
+                    await channel.send(embed=embed)
+                    break
+    except Exception as e:
+        logger.warning(f"⚠️ Could not notify guild {guild_id} about cleanup: {e}")
 
 @tasks.loop(minutes=30)  # Run cleanup every 30 minutes
 async def cleanup_inactive_games():
     """Remove games that haven't been active for a specified time."""
     current_time = time.time()
-    inactive_threshold = 2 * 60 * 60  # 2 hours in seconds
-    abandoned_threshold = 24 * 60 * 60  # 24 hours for completely abandoned games
     
     to_remove = []
     
-    for guild_id, game_state in games.items():
-        time_since_activity = current_time - game_state.get('last_activity', 0)
-        time_since_creation = current_time - game_state.get('created_at', 0)
+    # Only pop games whose scheduled expiry has passed; activity since then just reschedules them
+    while expiry_heap and expiry_heap[0][0] <= current_time:
+        expiry, guild_id = heapq.heappop(expiry_heap)
+        game_state = games.get(guild_id)
+        if game_state is None or game_state.scheduled_expiry != expiry:
+            continue  # Stale entry for a removed or rescheduled game
+        game_state.scheduled_expiry = None
+        
+        time_since_activity = current_time - game_state.last_activity
+        time_since_creation = current_time - game_state.created_at
         
         # Remove if:
         # 1. Game hasn't started and was created more than 24 hours ago
         # 2. Game was active but hasn't been touched in 2+ hours
-        should_remove = False
-        reason = ""
+        reason = None
         
-        if not game_state['game_started'] and time_since_creation > abandoned_threshold:
-            should_remove = True
+        if not game_state.game_started and time_since_creation > ABANDONED_THRESHOLD:
             reason = "never started and created 24+ hours ago"
-        elif game_state['game_started'] and time_since_activity > inactive_threshold:
-            should_remove = True
+        elif game_state.game_started and time_since_activity > INACTIVE_THRESHOLD:
             reason = "inactive for 2+ hours"
-        elif not game_state['game_started'] and time_since_activity > inactive_threshold:
-            should_remove = True
+        elif not game_state.game_started and time_since_activity > INACTIVE_THRESHOLD:
             reason = "lobby inactive for 2+ hours"
         
-        if should_remove:
-            to_remove.append((guild_id, reason))
+        if reason:
+            to_remove.append((guild_id, game_state, reason))
+        else:
+            schedule_expiry(guild_id, game_state)
     
     # Remove the identified games
-    for guild_id, reason in to_remove:
+    removed = 0
+    for guild_id, game_state, reason in to_remove:
+        # Skip games replaced since the scan or with a command currently holding the lock
+        if games.get(guild_id) is not game_state:
+            continue
+        if game_state.lock.locked():
+            schedule_expiry(guild_id, game_state)
+            continue
         del games[guild_id]
-        print(f"🧹 Cleaned up game for guild {guild_id}: {reason}")
+        removed += 1
+        if __debug__:
+            logger.debug(f"🧹 Cleaned up game for guild {guild_id}: {reason}")
         
-        # Try to notify the guild if possible
-        try:
-            guild = bot.get_guild(guild_id)
-            if guild:
-                # Find a general channel to send cleanup notification
-                for channel in guild.text_channels:
-                    if channel.permissions_for(guild.me).send_messages:
-                        embed = discord.Embed(
-                            title="🧹 Game Cleanup",
-                            description=f"The Coup game in this server was automatically cleaned up due to inactivity.\n\nReason: {reason}",
-                            color=discord.Color.orange()
-                        )
-                        embed.set_footer(text="Use !start to begin a new game")
-                        await channel.send(embed=embed)
-                        break
-        except Exception as e:
-            print(f"⚠️ Could not notify guild {guild_id} about cleanup: {e}")
+        # Notify in the background so a slow channel doesn't hold up the rest of the cleanup
+        spawn(notify_guild_cleanup(guild_id, reason))
+    
+    if __debug__ and removed:
+        logger.debug(f"🧹 Cleanup complete: removed {removed} inactive games")
+        logger.debug(f"📊 Active games remaining: {len(games)}")
     
-    if to_remove:
-        print(f"🧹 Cleanup complete: removed {len(to_remove)} inactive games")
-        print(f"📊 Active games remaining: {len(games)}")
+    # Go dormant until get_game_state creates another game; any heap entries left are stale
+    if not games:
+        expiry_heap.clear()
+        cleanup_inactive_games.cancel()
 
 @cleanup_inactive_games.before_loop
 async def before_cleanup():
     """Wait for the bot to be ready before starting cleanup."""
     await bot.wait_until_ready()
-    print("🧹 Game cleanup task started - will run every 30 minutes")
+    if __debug__:
+        logger.debug("🧹 Game cleanup task started - will run every 30 minutes while games exist")
 
 # Start the cleanup task when the bot starts
 @bot.event
@@ -253,9 +511,15 @@ async def on_ready():
     for guild in bot.guilds:
         logger.debug(f"SYSTEM: Connected to guild [{guild.name}] (ID: {guild.id})")
     
-    # Start the cleanup task
-    if not cleanup_inactive_games.is_running():
-        cleanup_inactive_games.start()
+    # The cleanup task is started by get_game_state once a game exists
+    
+    # Start the DM outbox
+    if not dm_worker.is_running():
+        dm_worker.start()
+    
+    # Start the stats log flusher
+    if not flush_stats.is_running():
+        flush_stats.start()
 
 @bot.event
 async def on_guild_join(guild):
@@ -266,11 +530,32 @@ async def on_guild_join(guild):
 async def on_guild_remove(guild):
     """Log when bot is removed from a guild and clean up its game state."""
     logger.info(f"SYSTEM: Removed from guild [{guild.name}] (ID: {guild.id}) - Total guilds: {len(bot.guilds)}")
+    _GUILD_NAME_CACHE.pop(guild.id, None)
     
     # Clean up any game state for this guild
     if guild.id in games:
         del games[guild.id]
         logger.info(f"CLEANUP: Removed game state for [{guild.name}]")
+
+@bot.event
+async def on_member_remove(member):
+    """Flag a player who left the server so turn checks skip the member lookup."""
+    game_state = games.get(member.guild.id)
+    if game_state and member.id in game_state.players:
+        game_state.players[member.id].in_guild = False
+
+@bot.event
+async def on_member_join(member):
+    """Clear the flag again if a player rejoins mid-game."""
+    game_state = games.get(member.guild.id)
+    if game_state and member.id in game_state.players:
+        game_state.players[member.id].in_guild = True
+
+@bot.event
+async def on_guild_update(before, after):
+    """Drop the cached guild name when a guild is renamed."""
+    if before.name != after.name:
+        _GUILD_NAME_CACHE.pop(after.id, None)
         
 # NEW: Admin command to manually trigger cleanup or check status
 @bot.command(name="cleanup_status")
@@ -288,8 +573,8 @@ async def cleanup_status(ctx):
         return
     
     inactive_info = []
-    for guild_id, game_state in games.items():
-        time_since_activity = current_time - game_state.get('last_activity', 0)
+    for guild_id, game_state in list(games.items()):
+        time_since_activity = current_time - game_state.last_activity
         hours_inactive = time_since_activity / 3600
         
         guild_name = "Unknown"
@@ -333,129 +618,165 @@ COLORS = {
 }
 
 # Card-to-image mapping
-card_images = {
+card_images: Final[Mapping[str, str]] = MappingProxyType({
     "Duke": "https://i.imgur.com/QCU6dxS.png",
     "Assassin": "https://i.imgur.com/LrUYiix.png",
     "Captain": "https://i.imgur.com/M2VbuYy.png",
     "Ambassador": "https://i.imgur.com/og1XpMZ.png",
     "Contessa": "https://i.imgur.com/IUdg094.png"
+})
+
+# Per-card emoji for the table's discard pile
+CARD_EMOJIS = {
+    "Duke": "👑",
+    "Assassin": "🗡️", 
+    "Captain": "⚓",
+    "Ambassador": "🤝",
+    "Contessa": "🛡️"
+}
+
+# Card-loss announcement templates; copied per loss so only title/description are set
+CARD_LOSS_EMBEDS = {
+    card: discord.Embed(color=COLORS['loss']).set_image(url=url)
+    for card, url in card_images.items()
 }
 
 # [REST OF YOUR ORIGINAL CODE CONTINUES HERE - I'm showing just the cleanup additions]
 # Visual helper functions
+@functools.lru_cache(maxsize=256)
 def create_separator(text):
     """Create a visual separator line."""
     return f"🎮 ═══ {text.upper()} ═══ 🎮"
 
+# Fixed titles, built once at import
+FORCED_COUP_TITLE = create_separator("⚔️ FORCED COUP TURN ⚔️")
+CARD_REVEALED_TITLE = create_separator("🃏 CARD REVEALED! 🃏")
+CARD_LOST_TITLE = create_separator("💀 CARD LOST! 💀")
+
+@functools.lru_cache(maxsize=256)
+def _format_action_result(action, player_name, target_name):
+    """Build (and cache) the action result line for the given names."""
+    if target_name is not None:
+        return f"⚔️ **{player_name}** → **{target_name}** • {action.upper()}"
+    return f"🎯 **{player_name}** • {action.upper()}"
+
+@functools.lru_cache(maxsize=256)
+def coin_change(old_coins, delta):
+    """Coins field text for a balance change, e.g. "2 → **4** (+2)". Cached: balances are small ints."""
+    return f"{old_coins} → **{old_coins + delta}** ({delta:+d})"
+
 def create_action_result(action, player, target=None, details=None):
     """Create visually appealing action result."""
     player_name = getattr(player, 'name', 'Unknown Player')
-    
-    if target:
-        target_name = getattr(target, 'name', 'Unknown Player')
-        return f"⚔️ **{player_name}** → **{target_name}** • {action.upper()}"
-    else:
-        return f"🎯 **{player_name}** • {action.upper()}"
+    target_name = getattr(target, 'name', 'Unknown Player') if target else None
+    return _format_action_result(action, player_name, target_name)
 
 # Helper functions
-def shuffle_deck(guild_id):
+def shuffle_deck(guild_id, game_state=None):
     """Shuffle the deck for a specific guild."""
-    game_state = get_game_state(guild_id)  # This updates activity
-    random.shuffle(game_state['court_deck'])
+    if game_state is None:
+        game_state = get_game_state(guild_id)  # This updates activity
+    game_state.rng.shuffle(game_state.court_deck)
 
-def deal_cards(guild_id):
+def deal_cards(guild_id, game_state=None):
     """Deal cards to players in a specific guild."""
-    game_state = get_game_state(guild_id)
+    if game_state is None:
+        game_state = get_game_state(guild_id)
     
     # Check if we have enough cards
-    total_cards_needed = len(game_state['players']) * 2
-    if len(game_state['court_deck']) < total_cards_needed:
-        logger.error(f"DECK_ERROR: Not enough cards! Need {total_cards_needed}, have {len(game_state['court_deck'])}")
+    total_cards_needed = len(game_state.players) * 2
+    if len(game_state.court_deck) < total_cards_needed:
+        logger.error(f"DECK_ERROR: Not enough cards! Need {total_cards_needed}, have {len(game_state.court_deck)}")
         return False
     
-    for player in game_state['players']:
-        if len(game_state['court_deck']) < 2:
-            logger.error(f"DECK_ERROR: Ran out of cards while dealing to {getattr(player, 'name', 'Unknown')}")
+    for seat in game_state.players.values():
+        if len(game_state.court_deck) < 2:
+            logger.error(f"DECK_ERROR: Ran out of cards while dealing to {getattr(seat.member, 'name', 'Unknown')}")
             return False
-        game_state['players'][player]["cards"] = [game_state['court_deck'].pop(), game_state['court_deck'].pop()]
+        seat.cards = [game_state.court_deck.pop(), game_state.court_deck.pop()]
     
     return True
 
-async def lose_influence_with_reveal(ctx, player, reason="loses"):
+async def lose_influence_with_reveal(ctx, player, reason="loses", game_state=None):
     """Make a player lose one character card, add it to discarded pile, and show the card lost."""
-    game_state = get_game_state(ctx.guild.id)
+    if game_state is None:
+        game_state = get_game_state(ctx.guild.id)
     
-    if len(game_state['players'][player]["cards"]) == 0:
+    if not game_state.alive.get(player.id):
         return False  # Player is already out
     
-    card_lost = game_state['players'][player]["cards"].pop()
-    game_state['discarded_cards'].append(card_lost)  # Add to visible discard pile
+    card_lost = game_state.players[player.id].cards.pop()
+    game_state.discarded_cards.append(card_lost)  # Add to visible discard pile
+    if not game_state.players[player.id].cards:
+        game_state.alive[player.id] = False
+        game_state.alive_count -= 1
     
     # Show the card that was lost with image
-    embed = await create_embed(
-        create_separator("💀 CARD LOST! 💀"),
-        f"**{player.name}** {reason} their **{card_lost}**!",
-        COLORS['loss'],
-        image_url=card_images[card_lost]
-    )
+    embed = copy.copy(CARD_LOSS_EMBEDS[card_lost])
+    embed.title = CARD_LOST_TITLE
+    embed.description = f"**{player.name}** {reason} their **{card_lost}**!"
     await ctx.send(embed=embed)
     
     return card_lost
 
-def is_player_alive(guild_id, player):
-    """Check if a player is still in the game."""
-    game_state = get_game_state(guild_id)
-    
-    # First check if player is in the game at all
-    if player not in game_state['players']:
-        return False
-    
-    # Then check if they have cards
-    return len(game_state['players'][player]["cards"]) > 0
-
-
-
-def check_win_condition(guild_id):
+def check_win_condition(guild_id, game_state=None):
     """Check if only one player remains."""
-    game_state = get_game_state(guild_id)
-    alive_players = [player for player in game_state['players'] if is_player_alive(guild_id, player)]
-    if len(alive_players) == 1:
-        return alive_players[0]
+    if game_state is None:
+        game_state = get_game_state(guild_id)
+    if game_state.alive_count == 1:
+        return next(player for player in game_state.turn_order if game_state.alive[player.id])
     return None
 
-def get_next_player(guild_id, current):
-    """Get the next alive player in turn order."""
-    game_state = get_game_state(guild_id)
-    player_list = list(game_state['players'].keys())
-    current_index = player_list.index(current)
-    next_index = (current_index + 1) % len(player_list)
-    while not is_player_alive(guild_id, player_list[next_index]):
-        next_index = (next_index + 1) % len(player_list)
-    return player_list[next_index]
+def _next_alive_index(game_state, current):
+    """Index in turn_order of the next alive player after current, without moving the turn index."""
+    turn_order = game_state.turn_order
+    # The turn index normally already points at the current player
+    current_index = game_state.turn_index
+    if turn_order[current_index] != current:
+        current_index = turn_order.index(current)
+    next_index = (current_index + 1) % len(turn_order)
+    while not game_state.alive[turn_order[next_index].id]:
+        next_index = (next_index + 1) % len(turn_order)
+    return next_index
+
+def peek_next_player(guild_id, current, game_state=None):
+    """Get the next alive player in turn order, leaving the turn index alone."""
+    if game_state is None:
+        game_state = get_game_state(guild_id)
+    return game_state.turn_order[_next_alive_index(game_state, current)]
+
+def get_next_player(guild_id, current, game_state=None):
+    """Get the next alive player in turn order and move the turn index to them."""
+    if game_state is None:
+        game_state = get_game_state(guild_id)
+    next_index = _next_alive_index(game_state, current)
+    game_state.turn_index = next_index
+    return game_state.turn_order[next_index]
+
+# Permissions the bot needs in a game channel, with display names for error messages
+REQUIRED_PERMISSIONS = {
+    'send_messages': 'Send Messages',
+    'embed_links': 'Embed Links', 
+    'add_reactions': 'Add Reactions',
+    'manage_messages': 'Manage Messages'
+}
+REQUIRED_PERMISSIONS_MASK = discord.Permissions(**dict.fromkeys(REQUIRED_PERMISSIONS, True)).value
 
 def check_bot_permissions(ctx):
     """Check if bot has required permissions in this channel."""
     if not ctx.guild:
-        return True  # DM channels always work
+        return True, []  # DM channels always work
     
     permissions = ctx.channel.permissions_for(ctx.guild.me)
-    required_permissions = {
-        'send_messages': 'Send Messages',
-        'embed_links': 'Embed Links', 
-        'add_reactions': 'Add Reactions',
-        'manage_messages': 'Manage Messages'
-    }
-    
-    missing = []
-    for perm_name, display_name in required_permissions.items():
-        if not getattr(permissions, perm_name):
-            missing.append(display_name)
+    if permissions.value & REQUIRED_PERMISSIONS_MASK == REQUIRED_PERMISSIONS_MASK:
+        return True, []
     
-    if missing:
-        logger.error(f"PERMISSIONS: Missing {missing} in [{ctx.guild.name}] #{ctx.channel.name}")
-        return False, missing
+    # Slow path: work out which ones are missing for the error message
+    missing = [display_name for perm_name, display_name in REQUIRED_PERMISSIONS.items()
+               if not getattr(permissions, perm_name)]
     
-    return True, []
+    logger.error(f"PERMISSIONS: Missing {missing} in [{ctx.guild.name}] #{ctx.channel.name}")
+    return False, missing
 
 async def send_permission_error(ctx, missing_permissions):
     """Send permission error message (fallback method)."""
@@ -467,7 +788,7 @@ async def send_permission_error(ctx, missing_permissions):
         # If we can't even send messages, there's nothing we can do
         logger.error(f"PERMISSIONS: Cannot send messages in {ctx.guild.name} #{ctx.channel.name}")
 
-async def create_embed(title, description, color, fields=None, image_url=None):
+def create_embed(title, description, color, fields=None, image_url=None):
     """Helper function to create embeds consistently with error handling."""
     try:
         embed = discord.Embed(title=title, description=description, color=color)
@@ -478,14 +799,14 @@ async def create_embed(title, description, color, fields=None, image_url=None):
             embed.set_image(url=image_url)
         return embed
     except Exception as e:
-        print(f"⚠️ Error creating embed: {e}")
+        logger.warning(f"⚠️ Error creating embed: {e}")
         # Return a simple fallback embed
         return discord.Embed(title="Error", description="An error occurred creating this message.", color=discord.Color.red())
 
 async def send_embed(ctx, title, description, color, fields=None, image_url=None):
     """Helper function to send embeds quickly with error handling and rate limit protection."""
     try:
-        embed = await create_embed(title, description, color, fields, image_url)
+        embed = create_embed(title, description, color, fields, image_url)
         return await safe_send_with_retry(ctx, embed=embed)
     except discord.HTTPException as e:
         logger.error(f"[{ctx.guild.name if ctx.guild else 'DM'}] EMBED_ERROR: Error sending embed: {e}")
@@ -496,9 +817,25 @@ async def send_embed(ctx, title, description, color, fields=None, image_url=None
             logger.error(f"[{ctx.guild.name if ctx.guild else 'DM'}] SEND_ERROR: Could not send fallback message either")
             return None
 
+# Error replies never ping anyone, even when they echo back what the user typed
+NO_MENTIONS = discord.AllowedMentions.none()
+
 async def send_error(ctx, title, description, auto_delete=True):
     """Send error message with consistent styling and optional auto-delete."""
-    message = await send_embed(ctx, title, description, discord.Color.red())
+    return await send_error_embed(ctx, create_embed(title, description, discord.Color.red()), auto_delete)
+
+async def send_error_embed(ctx, embed, auto_delete=True):
+    """Send an already-built error embed, with send_error's text fallback and auto-delete."""
+    try:
+        message = await safe_send_with_retry(ctx, embed=embed, allowed_mentions=NO_MENTIONS)
+    except discord.HTTPException as e:
+        logger.error(f"[{ctx.guild.name if ctx.guild else 'DM'}] EMBED_ERROR: Error sending embed: {e}")
+        try:
+            message = await safe_send_with_retry(ctx, content=f"**{embed.title}**\n{embed.description}",
+                                                 allowed_mentions=NO_MENTIONS)
+        except discord.HTTPException:
+            logger.error(f"[{ctx.guild.name if ctx.guild else 'DM'}] SEND_ERROR: Could not send fallback message either")
+            message = None
     if auto_delete and message:
         # Delete error messages after 20 seconds
         try:
@@ -515,44 +852,139 @@ async def send_info(ctx, title, description):
     """Send info message with consistent styling."""
     return await send_embed(ctx, title, description, discord.Color.blue())
 
-async def safe_send_dm(user, embed_or_content, fallback_message=None):
-    """Safely send DM with comprehensive error handling and retry logic."""
-    max_retries = 3
-    retry_delay = 1
+class TokenBucket:
+    """Async token bucket: callers only wait once the burst capacity is used up."""
+    __slots__ = ("rate", "capacity", "tokens", "last_refill")
+    
+    def __init__(self, rate, capacity):
+        self.rate = rate  # Tokens refilled per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+    
+    async def acquire(self):
+        """Take one token, sleeping only as long as it takes to refill one."""
+        while True:
+            # No await between refill and take, so concurrent callers can't double-spend
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
     
-    for attempt in range(max_retries):
-        try:
-            if isinstance(embed_or_content, discord.Embed):
-                await user.send(embed=embed_or_content)
-            else:
-                await user.send(embed_or_content)
-            logger.debug(f"DM_SUCCESS: Sent DM to {user.name}")
-            return True, None
-        except discord.Forbidden:
-            logger.warning(f"DM_FAILED: {user.name} has DMs disabled or blocked")
-            return False, "DMs are disabled or blocked"
-        except discord.HTTPException as e:
-            if e.status == 429:  # Rate limited
-                retry_after = getattr(e, 'retry_after', 1)
-                logger.warning(f"DM_RATE_LIMITED: Waiting {retry_after}s before retry to {user.name}")
-                await asyncio.sleep(retry_after)
-                continue
-            elif attempt < max_retries - 1:
-                await asyncio.sleep(retry_delay)
-                retry_delay *= 2  # Exponential backoff
-                continue
+    def is_idle(self, now):
+        """True once the bucket has refilled to capacity, i.e. it's as good as a fresh one."""
+        return self.tokens + (now - self.last_refill) * self.rate >= self.capacity
+
+# (rate per second, burst capacity) for each kind of route we throttle ourselves on
+ROUTE_LIMITS = {
+    "reactions": (4, 5),
+    "dm": (1, 5),
+}
+_RATE_BUCKETS = {}  # {"<route>:<id>": TokenBucket}
+RATE_BUCKET_SWEEP_SIZE = 512  # Drop idle buckets once the table grows past this
+_rate_bucket_sweep_at = RATE_BUCKET_SWEEP_SIZE
+
+def _evict_idle_buckets():
+    """Drop buckets that have refilled completely; the next use just creates a fresh one."""
+    global _rate_bucket_sweep_at
+    now = time.monotonic()
+    for bucket_key in [k for k, bucket in _RATE_BUCKETS.items() if bucket.is_idle(now)]:
+        del _RATE_BUCKETS[bucket_key]
+    # Sweep again only after the table doubles, so sweeps stay amortized O(1) per new bucket
+    _rate_bucket_sweep_at = max(RATE_BUCKET_SWEEP_SIZE, 2 * len(_RATE_BUCKETS))
+
+def rate_bucket(route, key):
+    """Get the token bucket for one route, e.g. reactions on a channel or DMs to a user."""
+    bucket_key = f"{route}:{key}"
+    bucket = _RATE_BUCKETS.get(bucket_key)
+    if bucket is None:
+        if len(_RATE_BUCKETS) >= _rate_bucket_sweep_at:
+            _evict_idle_buckets()
+        bucket = _RATE_BUCKETS[bucket_key] = TokenBucket(*ROUTE_LIMITS[route])
+    return bucket
+
+# DM outbox: callers queue (user, payload, future, attempt) and await the future,
+# where payload is an Embed, a list of up to 10 Embeds sent as one message, or text,
+# while dm_worker delivers them and applies 429 backoff across every sender at once
+DM_QUEUE = asyncio.Queue()
+DM_MAX_RETRIES = 3
+DM_CONCURRENCY = 5  # Players whose DMs are in flight at once
+DM_RESULT_TIMEOUT = 60  # Seconds a caller waits for delivery before treating the DM as failed
+_dm_resume_at = 0.0  # Event loop time before which no DMs go out after a rate limit
+
+def _resolve_dm(future, result):
+    """Report a delivery result unless the caller already gave up."""
+    if not future.done():
+        future.set_result(result)
+
+async def _deliver_dm(user, embed_or_content, future, attempt):
+    """Send one queued DM, re-queuing it on rate limits and transient errors."""
+    global _dm_resume_at
+    if future.done():
+        return  # Caller timed out and was told it failed; a late copy could show a stale hand
+    try:
+        await rate_bucket("dm", user.id).acquire()
+        if isinstance(embed_or_content, discord.Embed):
+            await user.send(embed=embed_or_content)
+        elif isinstance(embed_or_content, list):
+            await user.send(embeds=embed_or_content)
+        else:
+            await user.send(embed_or_content)
+        logger.debug(f"DM_SUCCESS: Sent DM to {user.name}")
+        _resolve_dm(future, (True, None))
+    except discord.Forbidden:
+        logger.warning(f"DM_FAILED: {user.name} has DMs disabled or blocked")
+        _resolve_dm(future, (False, "DMs are disabled or blocked"))
+    except discord.HTTPException as e:
+        if attempt >= DM_MAX_RETRIES - 1:
             logger.error(f"DM_ERROR: Failed to send DM to {user.name}: {e}")
-            return False, f"Discord API error: {e}"
-        except Exception as e:
-            if attempt < max_retries - 1:
-                await asyncio.sleep(retry_delay)
-                continue
-            return False, f"Unexpected error: {e}"
-    
-    return False, "Failed after multiple retries"
+            _resolve_dm(future, (False, f"Discord API error: {e}"))
+        elif e.status == 429:  # Rate limited - pause the whole outbox, not just this DM
+            retry_after = getattr(e, 'retry_after', 1)
+            logger.warning(f"DM_RATE_LIMITED: Pausing DMs for {retry_after}s before retry to {user.name}")
+            _dm_resume_at = max(_dm_resume_at, asyncio.get_running_loop().time() + retry_after)
+            DM_QUEUE.put_nowait((user, embed_or_content, future, attempt + 1))
+        else:
+            await asyncio.sleep(2 ** attempt)  # Exponential backoff
+            DM_QUEUE.put_nowait((user, embed_or_content, future, attempt + 1))
+    except Exception as e:
+        if attempt >= DM_MAX_RETRIES - 1:
+            _resolve_dm(future, (False, f"Unexpected error: {e}"))
+        else:
+            await asyncio.sleep(1)
+            DM_QUEUE.put_nowait((user, embed_or_content, future, attempt + 1))
+
+@tasks.loop(seconds=0)
+async def dm_worker():
+    """Drain the DM outbox, holding every send while a rate limit is in effect."""
+    item = await DM_QUEUE.get()
+    if item[2].done():
+        return  # Abandoned by its caller; don't wait out a rate limit just to drop it
+    delay = _dm_resume_at - asyncio.get_running_loop().time()
+    if delay > 0:
+        await asyncio.sleep(delay)
+    # Deliver concurrently; each caller awaits its own result before queuing its next DM
+    spawn(_deliver_dm(*item))
+
+async def safe_send_dm(user, embed_or_content, fallback_message=None):
+    """Queue a DM on the outbox and wait for its (success, error_reason) result."""
+    future = asyncio.get_running_loop().create_future()
+    await DM_QUEUE.put((user, embed_or_content, future, 0))
+    # Bounded so a stalled outbox can't keep a guild-locked command waiting forever
+    try:
+        return await asyncio.wait_for(future, timeout=DM_RESULT_TIMEOUT)
+    except asyncio.TimeoutError:
+        # wait_for has already cancelled the future, so dm_worker drops the item instead of
+        # delivering it late (possibly after a newer hand update)
+        future.cancel()
+        logger.warning(f"DM_TIMEOUT: Gave up waiting to deliver a DM to {user.name}")
+        return False, "Timed out waiting for Discord to deliver the DM"
 async def handle_dm_failure(ctx, user, error_reason, action_description="receive important information"):
     """Handle DM failures with user-friendly feedback and guidance."""
-    error_embed = await create_embed(
+    error_embed = create_embed(
         "📬 DM Error",
         f"**{user.name}**, I couldn't send you a DM to {action_description}.",
         discord.Color.red(),
@@ -583,72 +1015,66 @@ async def handle_dm_failure(ctx, user, error_reason, action_description="receive
         # Fallback to simple message if embed fails
         await ctx.send(f"❌ {user.mention}, I couldn't DM you! Please enable DMs to play Coup.")
 
+# Card descriptions with commands and strategic info
+# Read-only so the shared constant can't be mutated by callers
+CARD_DESCRIPTIONS: Final[Mapping[str, Mapping[str, str]]] = MappingProxyType({
+    "Duke": MappingProxyType({
+        "description": "👑 **The Duke** - Master of Taxation & Foreign Affairs",
+        "abilities": "• Use `!tax` to take **3 coins** (can be challenged)\n• **Block foreign aid** attempts from other players\n• Great for building wealth quickly!",
+        "strategy": "💡 **Strategy:** Perfect for accumulating coins fast. Claim Duke to block others' foreign aid even if you don't have it!"
+    }),
+    "Assassin": MappingProxyType({
+        "description": "🗡️ **The Assassin** - Silent but Deadly",
+        "abilities": "• Use `!assassinate <target>` to eliminate a player for **3 coins**\n• Can be blocked by Contessa (the only defense!)\n• Cheaper alternative to coup!",
+        "strategy": "💡 **Strategy:** Eliminate threats early before they get 7 coins. Watch out for Contessa blocks!"
+    }),
+    "Captain": MappingProxyType({
+        "description": "⚓ **The Captain** - Master of the Seas & Theft",
+        "abilities": "• Use `!steal <target>` to take **2 coins** from another player\n• **Block steal attempts** against you\n• Aggressive coin acquisition!",
+        "strategy": "💡 **Strategy:** Great for slowing down rich opponents while boosting your own wealth. Can both steal AND defend!"
+    }),
+    "Ambassador": MappingProxyType({
+        "description": "🤝 **The Ambassador** - Diplomatic Exchange Specialist",
+        "abilities": "• Use `!exchange` to swap cards with the deck\n• **Block steal attempts** (same as Captain)\n• Get better cards when needed!",
+        "strategy": "💡 **Strategy:** Perfect for getting the cards you need. Also defends against stealing like Captain!"
+    }),
+    "Contessa": MappingProxyType({
+        "description": "🛡️ **The Contessa** - Guardian Against Assassination",
+        "abilities": "• **Block assassination attempts** - the only defense!\n• Cannot initiate actions, but invaluable for survival\n• Your life insurance policy!",
+        "strategy": "💡 **Strategy:** Keep this secret! It's your only defense against assassinations. Bluff having it when targeted!"
+    })
+})
+
+# Per-card DM embed templates; copied per send so only the title needs setting
+CARD_EMBEDS = {
+    card: discord.Embed(
+        description=f"{info['abilities']}\n\n{info['strategy']}",
+        color=discord.Color.green()
+    ).set_image(url=card_images[card])
+    for card, info in CARD_DESCRIPTIONS.items()
+}
+
+def card_embed_for(card, title):
+    """Return a fresh copy of a card's DM embed with the given title."""
+    embed = copy.copy(CARD_EMBEDS[card])
+    embed.title = title
+    return embed
+
 async def send_player_cards(player, cards, ctx=None):
     """Send cards to a player via DM with comprehensive error handling and fallbacks."""
     
-    # Card descriptions with commands and strategic info
-    card_descriptions = {
-        "Duke": {
-            "description": "👑 **The Duke** - Master of Taxation & Foreign Affairs",
-            "abilities": "• Use `!tax` to take **3 coins** (can be challenged)\n• **Block foreign aid** attempts from other players\n• Great for building wealth quickly!",
-            "strategy": "💡 **Strategy:** Perfect for accumulating coins fast. Claim Duke to block others' foreign aid even if you don't have it!"
-        },
-        "Assassin": {
-            "description": "🗡️ **The Assassin** - Silent but Deadly",
-            "abilities": "• Use `!assassinate <target>` to eliminate a player for **3 coins**\n• Can be blocked by Contessa (the only defense!)\n• Cheaper alternative to coup!",
-            "strategy": "💡 **Strategy:** Eliminate threats early before they get 7 coins. Watch out for Contessa blocks!"
-        },
-        "Captain": {
-            "description": "⚓ **The Captain** - Master of the Seas & Theft",
-            "abilities": "• Use `!steal <target>` to take **2 coins** from another player\n• **Block steal attempts** against you\n• Aggressive coin acquisition!",
-            "strategy": "💡 **Strategy:** Great for slowing down rich opponents while boosting your own wealth. Can both steal AND defend!"
-        },
-        "Ambassador": {
-            "description": "🤝 **The Ambassador** - Diplomatic Exchange Specialist",
-            "abilities": "• Use `!exchange` to swap cards with the deck\n• **Block steal attempts** (same as Captain)\n• Get better cards when needed!",
-            "strategy": "💡 **Strategy:** Perfect for getting the cards you need. Also defends against stealing like Captain!"
-        },
-        "Contessa": {
-            "description": "🛡️ **The Contessa** - Guardian Against Assassination",
-            "abilities": "• **Block assassination attempts** - the only defense!\n• Cannot initiate actions, but invaluable for survival\n• Your life insurance policy!",
-            "strategy": "💡 **Strategy:** Keep this secret! It's your only defense against assassinations. Bluff having it when targeted!"
-        }
-    }
-    
-    # Send a welcome header
-    header_embed = await create_embed(
+    # Build the whole hand up front so only the sends themselves are awaited
+    header_embed = create_embed(
         "🎮 Your Starting Hand",
         f"Welcome to Coup, **{player.name}**! You've been dealt **{len(cards)}** powerful characters. Here's your hand:",
         discord.Color.purple()
     )
-    
-    success, error_reason = await safe_send_dm(player, header_embed)
-    if not success:
-        if ctx:
-            await handle_dm_failure(ctx, player, error_reason, "receive your starting cards")
-        raise discord.Forbidden(f"Failed to send DM to {player.name}: {error_reason}")
-    
-    # Send each card as a detailed embed with image
-    for i, card in enumerate(cards, 1):
-        card_info = card_descriptions[card]
-        
-        card_embed = await create_embed(
-            f"Card {i}: {card_info['description']}",
-            f"{card_info['abilities']}\n\n{card_info['strategy']}",
-            discord.Color.green(),
-            image_url=card_images[card]
-        )
-        
-        success, error_reason = await safe_send_dm(player, card_embed)
-        if not success:
-            if ctx:
-                await handle_dm_failure(ctx, player, error_reason, f"receive card {i} details")
-            # Continue trying to send remaining cards
-            continue
-    
-    # Send strategy footer with bluffing tips
+    card_embeds = [
+        card_embed_for(card, f"Card {i}: {CARD_DESCRIPTIONS[card]['description']}")
+        for i, card in enumerate(cards, 1)
+    ]
     summary_cards = ", ".join(cards)
-    footer_embed = await create_embed(
+    footer_embed = create_embed(
         "🎯 Advanced Strategy Tips",
         f"**Your hand:** {summary_cards}\n\n"
         "🎭 **Master of Deception:**\n"
@@ -668,67 +1094,61 @@ async def send_player_cards(player, cards, ctx=None):
     )
     footer_embed.set_footer(text="🤫 Keep these cards secret! Your poker face starts now...")
     
+    # Send a welcome header
+    success, error_reason = await safe_send_dm(player, header_embed)
+    if not success:
+        if ctx:
+            await handle_dm_failure(ctx, player, error_reason, "receive your starting cards")
+        raise discord.Forbidden(f"Failed to send DM to {player.name}: {error_reason}")
+    
+    # Send each card as a detailed embed with image (awaited in turn to keep them in order)
+    for i, card_embed in enumerate(card_embeds, 1):
+        success, error_reason = await safe_send_dm(player, card_embed)
+        if not success:
+            if ctx:
+                await handle_dm_failure(ctx, player, error_reason, f"receive card {i} details")
+            # Continue trying to send remaining cards
+            continue
+    
+    # Send strategy footer with bluffing tips
     success, error_reason = await safe_send_dm(player, footer_embed)
     if not success and ctx:
         await handle_dm_failure(ctx, player, error_reason, "receive strategy tips")
 
-async def send_cards_update(guild_id, player, ctx=None):
+async def send_cards_update(guild_id, player, ctx=None, game_state=None):
     """Send updated cards to player with comprehensive error handling."""
-    game_state = get_game_state(guild_id)
-    
-    # Card descriptions with commands and strategic info (same as initial dealing)
-    card_descriptions = {
-        "Duke": {
-            "description": "👑 **The Duke** - Master of Taxation & Foreign Affairs",
-            "abilities": "• Use `!tax` to take **3 coins** (can be challenged)\n• **Block foreign aid** attempts from other players\n• Great for building wealth quickly!",
-            "strategy": "💡 **Strategy:** Perfect for accumulating coins fast. Claim Duke to block others' foreign aid even if you don't have it!"
-        },
-        "Assassin": {
-            "description": "🗡️ **The Assassin** - Silent but Deadly",
-            "abilities": "• Use `!assassinate <target>` to eliminate a player for **3 coins**\n• Can be blocked by Contessa (the only defense!)\n• Cheaper alternative to coup!",
-            "strategy": "💡 **Strategy:** Eliminate threats early before they get 7 coins. Watch out for Contessa blocks!"
-        },
-        "Captain": {
-            "description": "⚓ **The Captain** - Master of the Seas & Theft",
-            "abilities": "• Use `!steal <target>` to take **2 coins** from another player\n• **Block steal attempts** against you\n• Aggressive coin acquisition!",
-            "strategy": "💡 **Strategy:** Great for slowing down rich opponents while boosting your own wealth. Can both steal AND defend!"
-        },
-        "Ambassador": {
-            "description": "🤝 **The Ambassador** - Diplomatic Exchange Specialist",
-            "abilities": "• Use `!exchange` to swap cards with the deck\n• **Block steal attempts** (same as Captain)\n• Get better cards when needed!",
-            "strategy": "💡 **Strategy:** Perfect for getting the cards you need. Also defends against stealing like Captain!"
-        },
-        "Contessa": {
-            "description": "🛡️ **The Contessa** - Guardian Against Assassination",
-            "abilities": "• **Block assassination attempts** - the only defense!\n• Cannot initiate actions, but invaluable for survival\n• Your life insurance policy!",
-            "strategy": "💡 **Strategy:** Keep this secret! It's your only defense against assassinations. Bluff having it when targeted!"
-        }
-    }
+    if game_state is None:
+        game_state = get_game_state(guild_id)
+    cards = game_state.players[player.id].cards
     
-    # Send a welcome header
-    header_embed = await create_embed(
+    # Build the whole hand up front so only the sends themselves are awaited
+    header_embed = create_embed(
         "🔄 Your Updated Hand",
-        f"Your hand has been updated, **{player.name}**! You now have **{len(game_state['players'][player]['cards'])}** powerful characters. Here's your current hand:",
+        f"Your hand has been updated, **{player.name}**! You now have **{len(cards)}** powerful characters. Here's your current hand:",
         discord.Color.purple()
     )
+    card_embeds = [
+        card_embed_for(card, f"Card {i}: {CARD_DESCRIPTIONS[card]['description']}")
+        for i, card in enumerate(cards, 1)
+    ]
+    summary_cards = ", ".join(cards)
+    footer_embed = create_embed(
+        "🔄 Hand Updated",
+        f"**Your new hand:** {summary_cards}\n\n"
+        "Your cards have been updated! Continue playing with your new hand.",
+        discord.Color.gold()
+    )
+    footer_embed.set_footer(text="🤫 Keep these cards secret!")
     
+    # Send a welcome header
     success, error_reason = await safe_send_dm(player, header_embed)
     if not success:
         if ctx:
             await handle_dm_failure(ctx, player, error_reason, "receive your updated cards")
         return False
     
-    # Send each card as a detailed embed with image
-    for i, card in enumerate(game_state['players'][player]['cards'], 1):
-        card_info = card_descriptions[card]
-        
-        card_embed = await create_embed(
-            f"Card {i}: {card_info['description']}",
-            f"{card_info['abilities']}\n\n{card_info['strategy']}",
-            discord.Color.green(),
-            image_url=card_images[card]
-        )
-        
+    # Send each card as a detailed embed with image (awaited in turn to keep them in order)
+    for i, card_embed in enumerate(card_embeds, 1):
         success, error_reason = await safe_send_dm(player, card_embed)
         if not success:
             if ctx:
@@ -736,37 +1156,35 @@ async def send_cards_update(guild_id, player, ctx=None):
             continue
     
     # Send simple footer with new hand summary
-    summary_cards = ", ".join(game_state['players'][player]['cards'])
-    footer_embed = await create_embed(
-        "🔄 Hand Updated",
-        f"**Your new hand:** {summary_cards}\n\n"
-        "Your cards have been updated! Continue playing with your new hand.",
-        discord.Color.gold()
-    )
-    footer_embed.set_footer(text="🤫 Keep these cards secret!")
-    
     success, error_reason = await safe_send_dm(player, footer_embed)
     if not success and ctx:
         await handle_dm_failure(ctx, player, error_reason, "receive hand summary")
     
     return True
 
-async def safe_send_with_retry(ctx_or_channel, content=None, embed=None, max_retries=3):
+RETRY_BASE_DELAY = 0.5  # Seconds, doubled on each attempt
+RETRY_JITTER = 0.3  # Max random seconds added so concurrent retries don't collide
+
+def retry_delay(error, attempt):
+    """Backoff for a 429: at least Discord's retry_after, growing exponentially, plus jitter."""
+    return max(getattr(error, 'retry_after', 0) or 0, (2 ** attempt) * RETRY_BASE_DELAY) + random.uniform(0, RETRY_JITTER)
+
+async def safe_send_with_retry(ctx_or_channel, content=None, embed=None, max_retries=3, allowed_mentions=None, view=None):
     """Send message with automatic retry on rate limits."""
     for attempt in range(max_retries):
         try:
             if embed:
-                return await ctx_or_channel.send(embed=embed)
+                return await ctx_or_channel.send(embed=embed, allowed_mentions=allowed_mentions, view=view)
             else:
-                return await ctx_or_channel.send(content)
+                return await ctx_or_channel.send(content, allowed_mentions=allowed_mentions)
         except discord.HTTPException as e:
             if e.status == 429:  # Rate limited
-                retry_after = getattr(e, 'retry_after', 1)
-                logger.warning(f"RATE_LIMIT: Hit rate limit, retrying in {retry_after}s (attempt {attempt + 1}/{max_retries})")
-                await asyncio.sleep(retry_after)
                 if attempt == max_retries - 1:
                     logger.error(f"RATE_LIMIT: Failed after {max_retries} attempts")
                     raise
+                retry_after = retry_delay(e, attempt)
+                logger.warning(f"RATE_LIMIT: Hit rate limit, retrying in {retry_after:.2f}s (attempt {attempt + 1}/{max_retries})")
+                await asyncio.sleep(retry_after)
             else:
                 # Not a rate limit error, re-raise immediately
                 raise
@@ -774,53 +1192,77 @@ async def safe_send_with_retry(ctx_or_channel, content=None, embed=None, max_ret
             logger.error(f"RATE_LIMIT: Unexpected error in safe_send: {e}")
             raise
 
-async def safe_add_reactions(message, emojis, delay=0.25):
-    """Add multiple reactions with rate limit protection."""
-    for emoji in emojis:
-        try:
-            await message.add_reaction(emoji)
-            if len(emojis) > 1:  # Only add delay if multiple reactions
-                await asyncio.sleep(delay)
-        except discord.HTTPException as e:
-            if e.status == 429:
-                retry_after = getattr(e, 'retry_after', 1)
-                logger.warning(f"RATE_LIMIT: Reaction rate limited, waiting {retry_after}s")
-                await asyncio.sleep(retry_after)
-                try:
-                    await message.add_reaction(emoji)
-                except discord.HTTPException:
-                    logger.warning(f"RATE_LIMIT: Failed to add reaction {emoji} after retry")
-            else:
-                logger.warning(f"RATE_LIMIT: Failed to add reaction {emoji}: {e}")
+REACTION_CONCURRENCY = 4  # Reactions in flight at once on one message
+
+async def safe_add_reactions(message, emojis, ordered=False):
+    """Add multiple reactions with rate limit protection.
+    
+    They go out concurrently and may land in any order; pass ordered=True when the
+    order matters (e.g. numbered choices) to add them one after another instead.
+    """
+    bucket = rate_bucket("reactions", message.channel.id)
+    semaphore = asyncio.Semaphore(REACTION_CONCURRENCY)
+    
+    async def add_reaction(emoji):
+        async with semaphore:
+            try:
+                await bucket.acquire()  # Only waits once the channel's burst is spent
+                await message.add_reaction(emoji)
+            except discord.HTTPException as e:
+                if e.status == 429:
+                    # Jittered backoff keeps the concurrent retries from colliding again
+                    retry_after = retry_delay(e, 0)
+                    logger.warning(f"RATE_LIMIT: Reaction rate limited, waiting {retry_after:.2f}s")
+                    await asyncio.sleep(retry_after)
+                    try:
+                        await message.add_reaction(emoji)
+                    except discord.HTTPException:
+                        logger.warning(f"RATE_LIMIT: Failed to add reaction {emoji} after retry")
+                else:
+                    logger.warning(f"RATE_LIMIT: Failed to add reaction {emoji}: {e}")
+    
+    if ordered:
+        for emoji in emojis:
+            await add_reaction(emoji)
+        return
+    
+    # Each emoji is its own (message, emoji) bucket, so they can go out together
+    await asyncio.gather(*(add_reaction(emoji) for emoji in emojis))
 
-async def safe_send_multiple_dms(players, send_function, delay=0.5):
-    """Send DMs to multiple players with rate limit protection."""
+async def safe_send_multiple_dms(players, send_function, concurrency=DM_CONCURRENCY):
+    """Send DMs to multiple players concurrently; each player's own messages stay in order."""
     failed_players = []
+    semaphore = asyncio.Semaphore(concurrency)
     
-    for i, player in enumerate(players):
-        try:
-            success = await send_function(player)
-            if not success:
-                failed_players.append(player)
-            
-            # Add delay between DMs (except for the last one)
-            if i < len(players) - 1:
-                await asyncio.sleep(delay)
-                
-        except Exception as e:
-            logger.error(f"RATE_LIMIT: Failed to send DM to {player.name}: {e}")
+    async def bounded_send(player):
+        async with semaphore:
+            return await send_function(player)
+    
+    # DMs to different users use separate rate-limit buckets, so fan out across players
+    results = await asyncio.gather(*(bounded_send(player) for player in players), return_exceptions=True)
+    
+    for player, result in zip(players, results):
+        if isinstance(result, Exception):
+            logger.error(f"RATE_LIMIT: Failed to send DM to {player.name}: {result}")
+            failed_players.append(player)
+        elif not result:
             failed_players.append(player)
     
     return failed_players
 
 async def dramatic_countdown(ctx, title, description, color, seconds=3):
     """Create a dramatic countdown effect for big moments."""
-    embed = await create_embed(title, description, color)
+    embed = create_embed(title, description, color)
     message = await ctx.send(embed=embed)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
     
     for i in range(seconds, 0, -1):
         await asyncio.sleep(1)
-        countdown_embed = await create_embed(
+        # If the previous edit or event-loop lag put us behind the clock, skip this frame
+        if seconds + 1 - int(loop.time() - start) < i:
+            continue
+        countdown_embed = create_embed(
             f"{title} - {i}",
             f"{description}\n\n{'⏰' * i} **{i}** {'⏰' * i}",
             color
@@ -828,7 +1270,7 @@ async def dramatic_countdown(ctx, title, description, color, seconds=3):
         await message.edit(embed=countdown_embed)
     
     await asyncio.sleep(1)
-    final_embed = await create_embed(
+    final_embed = create_embed(
         title,
         f"{description}\n\n💥 **EXECUTE!** 💥",
         color
@@ -836,41 +1278,49 @@ async def dramatic_countdown(ctx, title, description, color, seconds=3):
     await message.edit(embed=final_embed)
     return message
 
-async def reveal_card_with_image(ctx, player, card, reason="reveals"):
-    """Show a card reveal with image and dramatic effect."""
-    embed = await create_embed(
-        create_separator("🃏 CARD REVEALED! 🃏"),
-        f"**{player.name}** {reason} the **{card}**!",
+async def reveal_challenge_failed(ctx, player, card, dm_notice=False):
+    """Announce a failed challenge: the card reveal, the result and the swap in a single embed."""
+    swap_text = f"**{player.name}** draws a new card from the deck."
+    if dm_notice:
+        swap_text += " I've sent you a DM with your updated hand!"
+    embed = create_embed(
+        CARD_REVEALED_TITLE,
+        f"**{player.name}** triumphantly reveals the **{card}**!",
         COLORS['special'],
+        [
+            {"name": "🃏 Revealed", "value": card, "inline": True},
+            {"name": "✅ Result", "value": f"Challenge Failed - **{player.name}** proves their claim! The {card} is shuffled back into the deck.", "inline": False},
+            {"name": "🔄 Card Swapped", "value": swap_text, "inline": False}
+        ],
         image_url=card_images[card]
     )
     await ctx.send(embed=embed)
 
-async def enhanced_turn_announcement(ctx, player, is_forced_coup=False):
+async def enhanced_turn_announcement(ctx, player, is_forced_coup=False, game_state=None):
     """Enhanced turn announcement with better visibility and None checking."""
     if not player:
         logger.error("PLAYER_ERROR: Cannot announce turn for None player")
         await ctx.send("❌ **Game Error**: Cannot determine whose turn it is. Game may need to be restarted.")
         return
     
-    game_state = get_game_state(ctx.guild.id)
+    if game_state is None:
+        game_state = get_game_state(ctx.guild.id)
     
-    # Verify player still exists in Discord
-    discord_user = ctx.guild.get_member(player.id) if hasattr(player, 'id') else None
-    if not discord_user:
+    # Verify player still exists in Discord (kept current by on_member_remove/on_member_join)
+    if not getattr(game_state.players.get(player.id), "in_guild", True):
         logger.warning(f"PLAYER_ERROR: Turn announcement for user who left: {getattr(player, 'name', 'Unknown')}")
         await ctx.send(f"⚠️ **Player Left**: {getattr(player, 'name', 'Unknown Player')} has left the server.")
         return
     
     player_name = getattr(player, 'name', 'Unknown Player')
     player_mention = getattr(player, 'mention', player_name)
-    player_coins = game_state['players'][player]["coins"] if player in game_state['players'] else 0
-    player_cards = len(game_state['players'][player]["cards"]) if player in game_state['players'] else 0
+    player_coins = game_state.players[player.id].coins if player.id in game_state.players else 0
+    player_cards = len(game_state.players[player.id].cards) if player.id in game_state.players else 0
     
     if is_forced_coup:
         # Special dramatic announcement for forced coup
-        embed = await create_embed(
-            create_separator("⚔️ FORCED COUP TURN ⚔️"),
+        embed = create_embed(
+            FORCED_COUP_TITLE,
             f"**{player_mention}** has {player_coins} coins and **MUST COUP!**",
             COLORS['warning'],
             [{"name": "💰 Coins", "value": f"{player_coins}", "inline": True},
@@ -879,7 +1329,7 @@ async def enhanced_turn_announcement(ctx, player, is_forced_coup=False):
         )
     else:
         # Regular turn with enhanced styling
-        embed = await create_embed(
+        embed = create_embed(
             create_separator(f"👑 {player_name.upper()}'S TURN 👑"),
             f"It's **{player_mention}**'s turn to take action!",
             COLORS['turn'],
@@ -890,203 +1340,205 @@ async def enhanced_turn_announcement(ctx, player, is_forced_coup=False):
     
     return await ctx.send(embed=embed)
 
-async def wait_for_reaction(ctx, action_message, valid_emojis, timeout=5, action_initiator=None):
-    """Wait for a reaction within specified seconds with teacup countdown. Race condition safe."""
-    game_state = get_game_state(ctx.guild.id)
-    
-    # Create a lock to prevent race conditions
-    reaction_lock = asyncio.Lock()
-    processed_reactions = set()  # Track message+emoji+user combinations to prevent duplicates
-    
-    # Add reactions first with rate limit protection
-    await safe_add_reactions(action_message, valid_emojis)
-    
-    # Small delay to ensure reactions are added before we start listening
-    await asyncio.sleep(0.3)
+@functools.lru_cache(maxsize=64)
+def countdown_frame(remaining, total):
+    """Teacup countdown text with `remaining` of `total` cups left, built once per pair."""
+    return f"Time remaining: {'🍵' * remaining}{'⚫' * (total - remaining)}"
 
-    async def check_existing_reactions():
-        """Check for existing reactions on the message."""
-        try:
-            # Always fetch fresh message to get current reactions
-            fresh_message = await ctx.channel.fetch_message(action_message.id)
-            
-            for reaction in fresh_message.reactions:
-                if str(reaction.emoji) in valid_emojis:
-                    # Get all users who reacted (excluding bots)
-                    async for user in reaction.users():
-                        if (user in game_state['players'] and 
-                            is_player_alive(ctx.guild.id, user) and  # Must be alive
-                            user != action_initiator and  # Cannot react to your own actions
-                            not user.bot and 
-                            (fresh_message.id, str(reaction.emoji), user.id) not in processed_reactions):
-                            
-                            # Mark this reaction as processed
-                            processed_reactions.add((fresh_message.id, str(reaction.emoji), user.id))
-                            logger.info(f"[{ctx.guild.name}] REACTION_DETECTED: {user.name} reacted {reaction.emoji}")
-                            return str(reaction.emoji), user
-            
-            return None, None
-        except discord.NotFound:
-            # Message was deleted
-            return None, None
-        except Exception as e:
-            print(f"⚠️ Error checking existing reactions: {e}")
-            return None, None
-
-    def check_new_reaction(reaction, user):
-        """Check function for new reactions."""
-        reaction_key = (reaction.message.id, str(reaction.emoji), user.id)
-        return (
-            user in game_state['players']  # Must be in the game
-            and is_player_alive(ctx.guild.id, user)  # Must be alive
-            and user != action_initiator  # Cannot react to your own actions
-            and reaction.message.id == action_message.id
-            and str(reaction.emoji) in valid_emojis
-            and not user.bot
-            and reaction_key not in processed_reactions
-        )
+# Button labels for the challenge/block window
+CHALLENGE_BUTTON_LABELS = {
+    "❓": "Challenge",
+    "🚫": "Block",
+}
 
-    # Countdown timer with teacups
-    teacups_full = "🍵" * timeout
-    teacups_empty = "⚫" * 0
-    countdown_message = await ctx.send(f"Time remaining: {teacups_full}{teacups_empty}")
+# Response sets for wait_for_reaction, in button order
+CHALLENGE_EMOJIS = ("❓",)
+BLOCK_EMOJIS = ("🚫",)
+CHALLENGE_OR_BLOCK_EMOJIS = ("❓", "🚫")
+
+class ChallengeView(discord.ui.View):
+    """Buttons for a challenge/block window; `future` resolves with the first eligible (emoji, user)."""
+    
+    def __init__(self, emojis, game_state, action_initiator=None):
+        super().__init__(timeout=None)  # wait_for_reaction owns the window length
+        self.alive = game_state.alive
+        self.initiator_id = action_initiator.id if action_initiator else None
+        self.future = asyncio.get_running_loop().create_future()
+        for emoji in emojis:
+            button = discord.ui.Button(emoji=emoji, label=CHALLENGE_BUTTON_LABELS.get(emoji),
+                                       style=discord.ButtonStyle.secondary)
+            button.callback = self._make_callback(emoji)
+            self.add_item(button)
+    
+    async def interaction_check(self, interaction):
+        """Only living players other than the one who acted may respond."""
+        user = interaction.user
+        if self.alive.get(user.id) and user.id != self.initiator_id and not user.bot:
+            return True
+        await interaction.response.send_message("🚫 You can't respond to this action.", ephemeral=True)
+        return False
+    
+    def _make_callback(self, emoji):
+        async def callback(interaction):
+            await interaction.response.defer()
+            if not self.future.done():
+                self.future.set_result((emoji, interaction.user))
+                logger.info(f"[{interaction.guild.name}] REACTION_DETECTED: {interaction.user.name} pressed {emoji}")
+        return callback
+
+async def _remove_view(message):
+    """Take the buttons off a closed challenge window."""
+    try:
+        await message.edit(view=None)
+    except discord.HTTPException:
+        pass
 
-    # Check for existing reactions first
-    async with reaction_lock:
-        emoji, user = await check_existing_reactions()
-        if emoji and user:
+async def wait_for_reaction(ctx, action_embed, valid_emojis, timeout=5, action_initiator=None, game_state=None):
+    """Send action_embed with challenge/block buttons and run the window, with teacup countdown.
+    
+    valid_emojis is one of the module-level *_EMOJIS tuples. Returns (emoji, user) for the
+    first eligible press, or (None, None) if the window closes.
+    """
+    if game_state is None:
+        game_state = get_game_state(ctx.guild.id)
+    
+    # The buttons go out with the message itself, so it's never shown without them;
+    # presses come back as interactions routed straight to the view
+    view = ChallengeView(valid_emojis, game_state, action_initiator)
+    try:
+        action_message = await safe_send_with_retry(ctx, embed=action_embed, view=view)
+    except discord.HTTPException as e:
+        logger.warning(f"[{ctx.guild.name}] Could not send challenge window: {e}")
+        return None, None
+    
+    # Countdown timer with teacups (skipped for very short waits, where it isn't worth the extra API calls)
+    countdown_message = None
+    last_content = countdown_frame(timeout, timeout)
+    if timeout > 2:
+        countdown_message = await ctx.send(last_content)
+
+    async def close_window():
+        """Stop the view, pull its buttons in the background and delete the countdown."""
+        view.stop()
+        spawn(_remove_view(action_message))
+        if countdown_message:
             try:
                 await countdown_message.delete()
             except discord.NotFound:
                 pass
-            return emoji, user
 
-    # Now wait for new reactions with countdown
     for i in range(timeout, -1, -1):
         try:
-            # Wait for new reaction with 1 second timeout
-            reaction, user = await bot.wait_for("reaction_add", timeout=1.0, check=check_new_reaction)
-            
-            # Mark this reaction as processed
-            async with reaction_lock:
-                reaction_key = (reaction.message.id, str(reaction.emoji), user.id)
-                if reaction_key not in processed_reactions:
-                    processed_reactions.add(reaction_key)
-                    try:
-                        await countdown_message.delete()
-                    except discord.NotFound:
-                        pass
-                    return str(reaction.emoji), user
-                    
+            # Wait up to a second for a button press
+            emoji, user = await asyncio.wait_for(asyncio.shield(view.future), timeout=1.0)
+            await close_window()
+            ensure_current_game(ctx, game_state)
+            return emoji, user
         except asyncio.TimeoutError:
-            # During each countdown second, also check for existing reactions
-            async with reaction_lock:
-                emoji, user = await check_existing_reactions()
-                if emoji and user:
-                    try:
-                        await countdown_message.delete()
-                    except discord.NotFound:
-                        pass
-                    return emoji, user
+            if countdown_message is None:
+                continue
             
-            # Update countdown display
-            if i == 0:
-                teacups_full = ""
-                teacups_empty = "⚫" * timeout
-            else:
-                teacups_full = "🍵" * i
-                teacups_empty = "⚫" * (timeout - i)
+            # Only hit the API when the rendered countdown actually changed
+            new_content = countdown_frame(i, timeout)
+            if new_content == last_content:
+                continue
+            last_content = new_content
             
             try:
-                await countdown_message.edit(content=f"Time remaining: {teacups_full}{teacups_empty}")
+                await countdown_message.edit(content=new_content)
             except discord.NotFound:
                 # Countdown message was deleted, create a new one
                 try:
-                    countdown_message = await ctx.send(f"Time remaining: {teacups_full}{teacups_empty}")
+                    countdown_message = await ctx.send(new_content)
                 except Exception:
                     # If we can't create countdown message, continue without it
                     pass
 
-    # Clean up countdown message
-    try:
-        await countdown_message.delete()
-    except discord.NotFound:
-        pass
+    # Window closed with no response
+    await close_window()
+    ensure_current_game(ctx, game_state)
         
     return None, None
 
-async def handle_player_elimination(ctx, player):
+async def handle_player_elimination(ctx, player, game_state=None):
     """Handle player elimination and check win condition. Returns (eliminated, game_ended, next_player)"""
-    game_state = get_game_state(ctx.guild.id)
+    if game_state is None:
+        game_state = get_game_state(ctx.guild.id)
     
-    if len(game_state['players'][player]["cards"]) == 0:
+    if not game_state.alive.get(player.id):
         await send_embed(ctx, "💀 Out of the Game", 
                         f"**{player.name}** has no more influence and is out of the game!",
                         discord.Color.red())
-        await asyncio.sleep(1)
+        await asyncio.sleep(DRAMATIC_PAUSE)
         
         # Get next player BEFORE deleting the current player
-        next_player_candidate = get_next_player(ctx.guild.id, player)
-        del game_state['players'][player]
+        next_player_candidate = peek_next_player(ctx.guild.id, player, game_state=game_state)
+        del game_state.players[player.id]
         
-        winner = check_win_condition(ctx.guild.id)
+        winner = check_win_condition(ctx.guild.id, game_state=game_state)
         if winner:
             await send_embed(ctx, "🏆 Game Over",
                            f"**{winner.name}** is the last player standing and wins the game!",
                            discord.Color.gold())
             
-            record_game_end(ctx.guild.id, winner)
+            record_game_end(ctx.guild.id, winner, game_state=game_state)
             
             # Reveal winner's hand for fun
-            await reveal_winner_hand(ctx, winner)
+            await reveal_winner_hand(ctx, winner, game_state=game_state)
             
             # End the game for this guild
-            game_state['game_started'] = False
-            game_state['players'] = {}
-            game_state['current_player'] = None
-            game_state['court_deck'] = ["Duke", "Assassin", "Contessa", "Captain", "Ambassador"] * 3
-            game_state['discarded_cards'] = []
-            game_state['game_history'] = []
-            shuffle_deck(ctx.guild.id)
+            game_state.game_started = False
+            game_state.players = {}
+            game_state.current_player = None
+            game_state.turn_order = []
+            game_state.alive = {}
+            game_state.alive_count = 0
+            game_state.court_deck = list(_FRESH_DECK)
+            game_state.discarded_cards.clear()
+            game_state.game_history.clear()
+            shuffle_deck(ctx.guild.id, game_state=game_state)
             return True, True, None  # eliminated, game_ended, next_player
         return True, False, next_player_candidate  # eliminated, not game_ended, next_player
     return False, False, None  # not eliminated, not game_ended, no next_player
 
-async def handle_card_swap(ctx, player, card_name):
-    """Handle swapping a specific card with deck - card goes to bottom, player gets top card."""
-    game_state = get_game_state(ctx.guild.id)
+async def handle_card_swap(ctx, player, card_name, game_state=None):
+    """Handle swapping a specific card with deck - card is shuffled in, player draws a random card."""
+    if game_state is None:
+        game_state = get_game_state(ctx.guild.id)
     
     # Check if deck has cards before swapping
-    if len(game_state['court_deck']) < 1:
+    if not game_state.court_deck:
         logger.error(f"DECK_ERROR: No cards in deck for swap! Player: {getattr(player, 'name', 'Unknown')}")
         await send_error(ctx, "🚫 Deck Error", 
                         "No cards remaining in deck for card swap! This is a serious bug.")
         return
     
     # Remove the revealed card from player's hand
-    if card_name in game_state['players'][player]["cards"]:
-        game_state['players'][player]["cards"].remove(card_name)
+    if card_name in game_state.players[player.id].cards:
+        game_state.players[player.id].cards.remove(card_name)
     else:
         logger.error(f"DECK_ERROR: Player {getattr(player, 'name', 'Unknown')} doesn't have {card_name} to swap")
         return
     
-    # Put the revealed card at the bottom of the deck
-    game_state['court_deck'].insert(0, card_name)
+    # Shuffle the revealed card back in and draw at random (as announced), without the
+    # whole-list shift that insert(0) costs
+    deck = game_state.court_deck
+    deck.append(card_name)
+    game_state.players[player.id].cards.append(deck.pop(game_state.rng.randrange(len(deck))))
     
-    # Player draws the top card from the deck
-    game_state['players'][player]["cards"].append(game_state['court_deck'].pop())
-    
-    await send_cards_update(ctx.guild.id, player)
+    await send_cards_update(ctx.guild.id, player, game_state=game_state)
+    ensure_current_game(ctx, game_state)
 
-async def reveal_winner_hand(ctx, winner):
+async def reveal_winner_hand(ctx, winner, game_state=None):
     """Reveal the winner's final hand to see if they were bluffing."""
-    game_state = get_game_state(ctx.guild.id)
-    winner_cards = game_state['players'][winner]['cards']
+    if game_state is None:
+        game_state = get_game_state(ctx.guild.id)
+    winner_cards = game_state.players[winner.id].cards
     
     # Create dramatic winner reveal
     await asyncio.sleep(2)  # Build suspense
     
-    header_embed = await create_embed(
+    header_embed = create_embed(
         "🏆 ═══ WINNER'S HAND REVEALED! ═══ 🏆",
         f"Let's see what **{winner.name}** was actually holding...\n"
         f"Did they lie? Did they tell the truth? The cards don't lie! 🃏",
@@ -1096,20 +1548,20 @@ async def reveal_winner_hand(ctx, winner):
     
     await asyncio.sleep(1)
     
-    # Send each card with image
-    for i, card in enumerate(winner_cards, 1):
-        card_embed = await create_embed(
-            f"Card {i}: {card}",
-            f"**{winner.name}** had the **{card}**!",
-            discord.Color.purple(),
-            image_url=card_images[card]
-        )
-        await ctx.send(embed=card_embed)
-        await asyncio.sleep(1)
+    # Show the whole hand in one embed, with the first card's art as the thumbnail
+    hand_embed = create_embed(
+        f"🃏 {winner.name}'s Cards",
+        f"**{winner.name}** had...",
+        discord.Color.purple(),
+        [{"name": f"Card {i}", "value": f"**{card}**", "inline": True} for i, card in enumerate(winner_cards, 1)]
+    )
+    if winner_cards:
+        hand_embed.set_thumbnail(url=card_images[winner_cards[0]])
+    await ctx.send(embed=hand_embed)
     
     # Fun summary
     cards_text = " & ".join(winner_cards)
-    summary_embed = await create_embed(
+    summary_embed = create_embed(
         "🎭 The Truth Revealed!",
         f"**{winner.name}** won with: **{cards_text}**\n\n"
         "Were they masters of deception or did they play it straight? 🤔\n"
@@ -1119,9 +1571,10 @@ async def reveal_winner_hand(ctx, winner):
     summary_embed.set_footer(text="Thanks for playing Coup! • The ultimate bluffing game")
     await ctx.send(embed=summary_embed)
 
-async def handle_challenge(ctx, claimer, challenger, required_card):
+async def handle_challenge(ctx, claimer, challenger, required_card, game_state=None):
     """Handle challenge logic and return (claim_legitimate, game_ended, eliminated_player, next_player_if_claimer_eliminated)."""
-    game_state = get_game_state(ctx.guild.id)
+    if game_state is None:
+        game_state = get_game_state(ctx.guild.id)
     
     # Add dramatic challenge announcement
     await dramatic_countdown(
@@ -1134,30 +1587,19 @@ async def handle_challenge(ctx, claimer, challenger, required_card):
     
     log_game_action("challenge", ctx.guild.id, challenger, claimer, f"Challenged {required_card} claim")
 
-    if required_card in game_state['players'][claimer]["cards"]:
+    if required_card in game_state.players[claimer.id].cards:
         # Challenge failed - claimer has the card
-        await reveal_card_with_image(ctx, claimer, required_card, "triumphantly reveals")
-        await asyncio.sleep(1)
-        
-        await send_embed(ctx, f"✅ Challenge Failed",
-                        f"**{claimer.name}** proves their claim! The {required_card} is shuffled back into the deck.",
-                        discord.Color.green())
-        await asyncio.sleep(1)
-        
-        # Swap the card
-        await handle_card_swap(ctx, claimer, required_card)
-        await send_embed(ctx, "🔄 Card Swapped",
-                        f"**{claimer.name}** draws a new card from the deck. I've sent you a DM with your updated hand!",
-                        discord.Color.blue())
-        await asyncio.sleep(1)
+        # Reveal, result and swap go out as one embed
+        await reveal_challenge_failed(ctx, claimer, required_card, dm_notice=True)
+        await handle_card_swap(ctx, claimer, required_card, game_state=game_state)
 
         # Challenger loses a card for false challenge
-        if len(game_state['players'][challenger]["cards"]) > 0:
+        if game_state.alive.get(challenger.id):
             log_game_action("card_lost", ctx.guild.id, challenger, claimer, f"Lost card for false challenge")
-            card_lost = await lose_influence_with_reveal(ctx, challenger, "loses a card for the false challenge and discards")
-            await asyncio.sleep(1)
+            card_lost = await lose_influence_with_reveal(ctx, challenger, "loses a card for the false challenge and discards", game_state=game_state)
+            await asyncio.sleep(DRAMATIC_PAUSE)
             
-            eliminated, game_ended, next_player_result = await handle_player_elimination(ctx, challenger)
+            eliminated, game_ended, next_player_result = await handle_player_elimination(ctx, challenger, game_state=game_state)
             return True, game_ended, challenger if eliminated else None, next_player_result
         
         return True, False, None, None  # claim_legitimate, not game_ended, no elimination, no next_player
@@ -1166,21 +1608,22 @@ async def handle_challenge(ctx, claimer, challenger, required_card):
         await send_embed(ctx, "🤥 Bluff Exposed!",
                         f"**{claimer.name}** was caught bluffing! They don't have the **{required_card}**!",
                         discord.Color.red())
-        await asyncio.sleep(1)
+        await asyncio.sleep(DRAMATIC_PAUSE)
         
-        if len(game_state['players'][claimer]["cards"]) > 0:
+        if game_state.alive.get(claimer.id):
             log_game_action("card_lost", ctx.guild.id, claimer, challenger, f"Lost card for failed bluff")
-            card_lost = await lose_influence_with_reveal(ctx, claimer, "loses a card for bluffing and discards")
-            await asyncio.sleep(1)
+            card_lost = await lose_influence_with_reveal(ctx, claimer, "loses a card for bluffing and discards", game_state=game_state)
+            await asyncio.sleep(DRAMATIC_PAUSE)
             
-            eliminated, game_ended, next_player_result = await handle_player_elimination(ctx, claimer)
+            eliminated, game_ended, next_player_result = await handle_player_elimination(ctx, claimer, game_state=game_state)
             return False, game_ended, claimer if eliminated else None, next_player_result
         
         return False, False, None, None  # claim_illegitimate, not game_ended, no elimination, no next_player
 
-async def handle_block_challenge(ctx, blocker, challenger, valid_cards):
+async def handle_block_challenge(ctx, blocker, challenger, valid_cards, game_state=None):
     """Handle challenge logic for blocks that can have multiple valid cards."""
-    game_state = get_game_state(ctx.guild.id)
+    if game_state is None:
+        game_state = get_game_state(ctx.guild.id)
     
     # Add dramatic challenge announcement
     await dramatic_countdown(
@@ -1194,7 +1637,7 @@ async def handle_block_challenge(ctx, blocker, challenger, valid_cards):
     log_game_action("challenge", ctx.guild.id, challenger, blocker, f"Challenged block")
 
     # Check if blocker has any of the valid cards
-    blocker_cards = game_state['players'][blocker]["cards"]
+    blocker_cards = game_state.players[blocker.id].cards
     valid_card_found = None
     for card in valid_cards:
         if card in blocker_cards:
@@ -1203,28 +1646,17 @@ async def handle_block_challenge(ctx, blocker, challenger, valid_cards):
 
     if valid_card_found:
         # Challenge failed - blocker has a valid card
-        await reveal_card_with_image(ctx, blocker, valid_card_found, "triumphantly reveals")
-        await asyncio.sleep(1)
-        
-        await send_embed(ctx, f"✅ Challenge Failed",
-                        f"**{blocker.name}** proves their claim! The {valid_card_found} is shuffled back into the deck.",
-                        discord.Color.green())
-        await asyncio.sleep(1)
-        
-        # Swap the card
-        await handle_card_swap(ctx, blocker, valid_card_found)
-        await send_embed(ctx, "🔄 Card Swapped",
-                        f"**{blocker.name}** draws a new card from the deck.",
-                        discord.Color.blue())
-        await asyncio.sleep(1)
+        # Reveal, result and swap go out as one embed
+        await reveal_challenge_failed(ctx, blocker, valid_card_found, dm_notice=False)
+        await handle_card_swap(ctx, blocker, valid_card_found, game_state=game_state)
 
         # Challenger loses a card for false challenge
-        if len(game_state['players'][challenger]["cards"]) > 0:
+        if game_state.alive.get(challenger.id):
             log_game_action("card_lost", ctx.guild.id, challenger, blocker, f"Lost card for false challenge")
-            card_lost = await lose_influence_with_reveal(ctx, challenger, "loses a card for the false challenge and discards")
-            await asyncio.sleep(1)
+            card_lost = await lose_influence_with_reveal(ctx, challenger, "loses a card for the false challenge and discards", game_state=game_state)
+            await asyncio.sleep(DRAMATIC_PAUSE)
             
-            eliminated, game_ended, next_player_result = await handle_player_elimination(ctx, challenger)
+            eliminated, game_ended, next_player_result = await handle_player_elimination(ctx, challenger, game_state=game_state)
             return True, game_ended, challenger if eliminated else None, next_player_result
         
         return True, False, None, None  # claim_legitimate, not game_ended, no elimination, no next_player
@@ -1233,140 +1665,182 @@ async def handle_block_challenge(ctx, blocker, challenger, valid_cards):
         await send_embed(ctx, "🤥 Block Bluff Exposed!",
                         f"**{blocker.name}** was caught bluffing! They don't have {' or '.join(valid_cards)}!",
                         discord.Color.red())
-        await asyncio.sleep(1)
+        await asyncio.sleep(DRAMATIC_PAUSE)
         
-        if len(game_state['players'][blocker]["cards"]) > 0:
+        if game_state.alive.get(blocker.id):
             log_game_action("card_lost", ctx.guild.id, blocker, challenger, f"Lost card for failed block bluff")
-            card_lost = await lose_influence_with_reveal(ctx, blocker, "loses a card for bluffing and discards")
-            await asyncio.sleep(1)
+            card_lost = await lose_influence_with_reveal(ctx, blocker, "loses a card for bluffing and discards", game_state=game_state)
+            await asyncio.sleep(DRAMATIC_PAUSE)
             
-            eliminated, game_ended, next_player_result = await handle_player_elimination(ctx, blocker)
+            eliminated, game_ended, next_player_result = await handle_player_elimination(ctx, blocker, game_state=game_state)
             return False, game_ended, blocker if eliminated else None, next_player_result
         
         return False, False, None, None  # claim_illegitimate, not game_ended, no elimination, no next_player
 
-async def check_forced_coup(ctx, player):
+async def check_forced_coup(ctx, player, game_state=None):
     """Check if player has 10+ coins and send forced coup message."""
-    game_state = get_game_state(ctx.guild.id)
-    if game_state['players'][player]["coins"] >= 10:
-        await enhanced_turn_announcement(ctx, player, is_forced_coup=True)
+    if game_state is None:
+        game_state = get_game_state(ctx.guild.id)
+    if game_state.players[player.id].coins >= 10:
+        await enhanced_turn_announcement(ctx, player, is_forced_coup=True, game_state=game_state)
         return True
     return False
 
-async def advance_turn(ctx, current_turn_player):
+async def advance_turn(ctx, current_turn_player, game_state=None):
     """Advance to the next player's turn. Handles case where current player was eliminated."""
-    game_state = get_game_state(ctx.guild.id)
+    if game_state is None:
+        game_state = get_game_state(ctx.guild.id)
+    ensure_current_game(ctx, game_state)  # Never announce a turn for a game that was ended
     
     # Check if the current turn player is still in the game
-    if current_turn_player not in game_state['players']:
+    if current_turn_player.id not in game_state.players and current_turn_player in game_state.turn_order:
+        # Player was eliminated, continue from their seat
+        game_state.current_player = get_next_player(ctx.guild.id, current_turn_player, game_state=game_state)
+    elif current_turn_player.id not in game_state.players:
         # Player was eliminated, we need to find who should be next
-        player_list = list(game_state['players'].keys())
-        if len(player_list) > 0:
-            game_state['current_player'] = player_list[0]  # Start with first remaining player
+        first = next(iter(game_state.players.values()), None)
+        if first is not None:
+            game_state.current_player = first.member  # Start with first remaining player
         else:
             return  # No players left (shouldn't happen due to win condition checks)
     else:
         # Normal case - current player is still alive
-        game_state['current_player'] = get_next_player(ctx.guild.id, current_turn_player)
+        game_state.current_player = get_next_player(ctx.guild.id, current_turn_player, game_state=game_state)
     
     # SAFETY CHECK: Make sure current player still exists as a Discord user
-    current_player = game_state['current_player']
+    current_player = game_state.current_player
     if not current_player:
         logger.error("PLAYER_ERROR: Current player is None after turn advance")
         await ctx.send("❌ **Game Error**: Current player not found. Game may need to be restarted.")
         return
     
     # Check if player still exists in Discord (not just the game)
-    discord_user = ctx.guild.get_member(current_player.id) if hasattr(current_player, 'id') else None
-    if not discord_user:
+    if not getattr(game_state.players.get(current_player.id), "in_guild", True):
         logger.warning(f"PLAYER_ERROR: Current player {getattr(current_player, 'name', 'Unknown')} left the server")
         await ctx.send(f"⚠️ **Player Left**: {getattr(current_player, 'name', 'Unknown Player')} has left the server and will be eliminated.")
         
         # Remove the player and advance to next
-        if current_player in game_state['players']:
-            del game_state['players'][current_player]
+        if current_player.id in game_state.players:
+            del game_state.players[current_player.id]
+        if game_state.alive.get(current_player.id):
+            game_state.alive[current_player.id] = False
+            game_state.alive_count -= 1
             
         # Check win condition
-        winner = check_win_condition(ctx.guild.id)
+        winner = check_win_condition(ctx.guild.id, game_state=game_state)
         if winner:
             await send_embed(ctx, "🏆 Game Over",
                            f"**{getattr(winner, 'name', 'Unknown Player')}** wins after other player left!",
                            discord.Color.gold())
             # Reset game
-            game_state['game_started'] = False
-            game_state['players'] = {}
-            game_state['current_player'] = None
+            game_state.game_started = False
+            game_state.players = {}
+            game_state.current_player = None
+            game_state.turn_order = []
+            game_state.alive = {}
+            game_state.alive_count = 0
             return
         
         # Recursively advance to next player
-        await advance_turn(ctx, current_player)
+        await advance_turn(ctx, current_player, game_state=game_state)
         return
     
     # Check if they're forced to coup first
-    forced_coup = await check_forced_coup(ctx, game_state['current_player'])
+    forced_coup = await check_forced_coup(ctx, game_state.current_player, game_state=game_state)
     
     # If not forced coup, send enhanced turn announcement
     if not forced_coup:
-        await enhanced_turn_announcement(ctx, game_state['current_player'], is_forced_coup=False)
-
-async def validate_turn(ctx, player):
-    """Check if it's the player's turn."""
-    game_state = get_game_state(ctx.guild.id)
-    if player != game_state['current_player']:
+        await enhanced_turn_announcement(ctx, game_state.current_player, is_forced_coup=False, game_state=game_state)
+
+# Emoji for each targeted action, used in its error titles; read-only and shared
+TARGETED_ACTION_EMOJIS: Final[Mapping[str, str]] = MappingProxyType({
+    "coup": "💥",
+    "assassinate": "🗡️", 
+    "steal": "💰"
+})
+
+async def validate_action(ctx, action_name, *, target=None, cost=0, cost_label=None, game_state=None):
+    """Run every precondition for ctx.author taking an action, sending the first failure as an error.
+    
+    Checks, in order: it's their turn, the target (if any) is in the game, alive and not
+    themselves, they can pay `cost`, and 10+ coins doesn't force a coup instead.
+    """
+    if game_state is None:
+        game_state = get_game_state(ctx.guild.id)
+    player = ctx.author
+    
+    if player != game_state.current_player:
         await send_error(ctx, "🚫 Not Your Turn", "It's not your turn!")
         return False
-    return True
-
-async def validate_target(ctx, target):
-    """Check if target is valid for actions."""
-    game_state = get_game_state(ctx.guild.id)
-    
-    # First check if target is in the game at all
-    if target not in game_state['players']:
-        await send_error(ctx, "🚫 Not in Game", f"{target.name} is not part of the current game!")
-        return False
     
-    # Then check if they're still alive
-    if not is_player_alive(ctx.guild.id, target):
-        await send_error(ctx, "🚫 Target Eliminated", f"{target.name} has already been eliminated!")
-        return False
+    if target is not None:
+        # First check if target is in the game at all
+        if target.id not in game_state.players:
+            await send_error(ctx, "🚫 Not in Game", f"{target.name} is not part of the current game!")
+            return False
+        
+        # Then check if they're still alive
+        if not game_state.alive.get(target.id):
+            await send_error(ctx, "🚫 Target Eliminated", f"{target.name} has already been eliminated!")
+            return False
+        
+        if player == target:
+            emoji = TARGETED_ACTION_EMOJIS.get(action_name, "🚫")
+            await send_error(ctx, f"{emoji} Cannot Target Yourself", 
+                            f"You cannot {action_name} yourself! Choose a different target.")
+            return False
     
-    return True
-
-async def validate_coins(ctx, player, required_coins, action_name):
-    """Check if player has enough coins for an action."""
-    game_state = get_game_state(ctx.guild.id)
-    if game_state['players'][player]["coins"] < required_coins:
+    coins = game_state.players[player.id].coins
+    if coins < cost:
         await send_error(ctx, "🚫 Insufficient Coins", 
-                        f"You need at least {required_coins} coins to {action_name}!")
+                        f"You need at least {cost} coins to {cost_label or action_name}!")
         return False
-    return True
-
-async def validate_action_allowed(ctx, player, action_name):
-    """Check if player can perform this action (10+ coins forces coup)."""
-    game_state = get_game_state(ctx.guild.id)
-    if game_state['players'][player]["coins"] >= 10 and action_name != "coup":
+    
+    # 10+ coins forces a coup
+    if coins >= 10 and action_name != "coup":
         await send_error(ctx, "🚫 Must Coup", 
-                        f"You have {game_state['players'][player]['coins']} coins and must coup! Use `!coup <target>`")
+                        f"You have {coins} coins and must coup! Use `!coup <target>`")
         return False
+    
     return True
 
-async def validate_self_target(ctx, player, target, action_name):
-    """Check if player is trying to target themselves."""
-    if player == target:
-        action_emojis = {
-            "coup": "💥",
-            "assassinate": "🗡️", 
-            "steal": "💰"
-        }
-        emoji = action_emojis.get(action_name, "🚫")
-        await send_error(ctx, f"{emoji} Cannot Target Yourself", 
-                        f"You cannot {action_name} yourself! Choose a different target.")
-        return False
-    return True
+# Lobby intro embed; fully static, so it is built once and reused for every !start
+_INTRO_FIELDS = [{"name": "Join the Game", "value": "React with ✅ to join! You have 10 seconds to join."}]
+_INTRO_EMBED = create_embed(
+    "🎮 Coup - The Ultimate Bluffing Game!",
+    "**Welcome to Coup!** 🎭\n\n"
+    "Coup is an exciting game of **deception, strategy, and betrayal**! Here's how it works:\n\n"
+    
+    "🃏 **Your Secret Identity:**\n"
+    "• You'll get 2 secret character cards (like Duke, Assassin, Captain)\n"
+    "• Each character has special powers you can use on your turn\n"
+    "• Keep your cards hidden from other players!\n\n"
+    
+    "💰 **Collect Coins & Take Actions:**\n"
+    "• Gain coins each turn through income, foreign aid, or special abilities\n"
+    "• Spend coins to eliminate other players (coup for 7 coins, assassinate for 3)\n"
+    "• Use character powers like stealing coins or blocking other players\n\n"
+    
+    "🎭 **The Art of Bluffing:**\n"
+    "• You can **claim to have ANY character** - even if you don't!\n"
+    "• Other players can challenge your claims if they think you're lying\n"
+    "• Get caught lying? Lose a card. Falsely accused? Your challenger loses a card!\n\n"
+    
+    "🏆 **How to Win:**\n"
+    "• Eliminate other players by making them lose all their cards\n"
+    "• Be the last player standing with at least 1 card remaining\n"
+    "• Master the balance of truth, lies, and timing!\n\n"
+    
+    "🎯 **Perfect for:** Social deduction fans, poker players, and anyone who loves mind games!\n\n"
+    "Ready to test your poker face? The game of lies begins now! 😈",
+    discord.Color.blue(),
+    _INTRO_FIELDS,
+    "https://m.media-amazon.com/images/I/71rycbSJlXL.jpg"
+)
 
 # Commands
 @bot.command(name="start")
+@guild_locked
 async def start(ctx):
     # Check bot permissions first
     has_perms, missing = check_bot_permissions(ctx)
@@ -1376,215 +1850,185 @@ async def start(ctx):
     
     game_state = get_game_state(ctx.guild.id)
 
-    if game_state['game_started']:
+    if game_state.game_started:
         await send_error(ctx, "🚫 Game Already in Progress", "A game is already in progress!")
         return
 
     # Reset game variables for this guild
-    game_state['players'] = {}
-    game_state['court_deck'] = ["Duke", "Assassin", "Contessa", "Captain", "Ambassador"] * 3
-    game_state['discarded_cards'] = []  # Reset discarded cards
-    game_state['game_history'] = []  # Reset game history
-    shuffle_deck(ctx.guild.id)
+    game_state.players = {}
+    game_state.turn_order = []
+    game_state.alive = {}
+    game_state.alive_count = 0
+    game_state.discarded_cards.clear()  # Reset discarded cards
+    game_state.game_history.clear()  # Reset game history
 
     # Send join message
-    fields = [{"name": "Join the Game", "value": "React with ✅ to join! You have 10 seconds to join."}]
-    embed = await create_embed(
-        "🎮 Coup - The Ultimate Bluffing Game!",
-        "**Welcome to Coup!** 🎭\n\n"
-        "Coup is an exciting game of **deception, strategy, and betrayal**! Here's how it works:\n\n"
-        
-        "🃏 **Your Secret Identity:**\n"
-        "• You'll get 2 secret character cards (like Duke, Assassin, Captain)\n"
-        "• Each character has special powers you can use on your turn\n"
-        "• Keep your cards hidden from other players!\n\n"
-        
-        "💰 **Collect Coins & Take Actions:**\n"
-        "• Gain coins each turn through income, foreign aid, or special abilities\n"
-        "• Spend coins to eliminate other players (coup for 7 coins, assassinate for 3)\n"
-        "• Use character powers like stealing coins or blocking other players\n\n"
-        
-        "🎭 **The Art of Bluffing:**\n"
-        "• You can **claim to have ANY character** - even if you don't!\n"
-        "• Other players can challenge your claims if they think you're lying\n"
-        "• Get caught lying? Lose a card. Falsely accused? Your challenger loses a card!\n\n"
-        
-        "🏆 **How to Win:**\n"
-        "• Eliminate other players by making them lose all their cards\n"
-        "• Be the last player standing with at least 1 card remaining\n"
-        "• Master the balance of truth, lies, and timing!\n\n"
-        
-        "🎯 **Perfect for:** Social deduction fans, poker players, and anyone who loves mind games!\n\n"
-        "Ready to test your poker face? The game of lies begins now! 😈",
-        discord.Color.blue(),
-        fields,
-        "https://m.media-amazon.com/images/I/71rycbSJlXL.jpg"
-    )
-    
-    game_state['join_message'] = await ctx.send(embed=embed)
-    await game_state['join_message'].add_reaction("✅")
+    game_state.join_message = await ctx.send(embed=_INTRO_EMBED)
+    await game_state.join_message.add_reaction("✅")
+
+    # Build and shuffle the deck while players are joining, so dealing after the countdown only pops cards
+    game_state.court_deck = list(_FRESH_DECK)
+    game_state.rng.shuffle(game_state.court_deck)
 
     # Countdown timer
-    countdown_message = await ctx.send("Time remaining: 🍵🍵🍵🍵🍵🍵🍵🍵🍵🍵")
-    for i in range(10, -1, -1):
-        await asyncio.sleep(1)
-        teacups = "🍵" * i + "⚫" * (10 - i) if i > 0 else "⚫" * 10
-        await countdown_message.edit(content=f"Time remaining: {teacups}")
+    # Tick every 2 seconds: 5 edits instead of 11 for the same 10-second window
+    countdown_message = await ctx.send(countdown_frame(10, 10))
+    for i in range(8, -1, -2):
+        await asyncio.sleep(2)
+        await countdown_message.edit(content=countdown_frame(i, 10))
 
     # Check who reacted
-    join_message = await ctx.channel.fetch_message(game_state['join_message'].id)
+    join_message = await ctx.channel.fetch_message(game_state.join_message.id)
+    # Only the ✅ reaction matters, so page through just its users
+    join_reaction = next((r for r in join_message.reactions if r.emoji == "✅"), None)
     reactors = set()
-    for reaction in join_message.reactions:
-        if reaction.emoji == "✅":
-            async for user in reaction.users():
-                if not user.bot:
-                    reactors.add(user)
+    if join_reaction:
+        async for user in join_reaction.users():
+            if not user.bot:
+                reactors.add(user)
 
     # Add reactors to the game
     for user in reactors:
-        game_state['players'][user] = {"cards": [], "coins": 2}
+        game_state.players[user.id] = PlayerState(member=user)
 
-    if len(game_state['players']) < 2:
+    if len(game_state.players) < 2:
         await send_error(ctx, "🚫 Not Enough Players", 
                         "Not enough players joined. The game requires at least 2 players.")
         return
 
     # Start the game
-    game_state['game_started'] = True
-    if not deal_cards(ctx.guild.id):
+    game_state.game_started = True
+    if not deal_cards(ctx.guild.id, game_state=game_state):
         # Deck error occurred
         await send_error(ctx, "🚫 Deck Error", 
                         "Not enough cards in the deck to start the game! This is a bug - please restart the bot.")
-        game_state['game_started'] = False
+        game_state.game_started = False
         return
     
-    # Randomize the player order for fairness
-    player_list = list(game_state['players'].keys())
-    random.shuffle(player_list)
-    
-    # Rebuild the players dict in the new randomized order
-    shuffled_players = {}
-    for player in player_list:
-        shuffled_players[player] = game_state['players'][player]
-    game_state['players'] = shuffled_players
-    
-    # Set the first player in the randomized order
-    game_state['current_player'] = player_list[0]
+    # Randomize the seating for fairness; the players dict itself is left untouched
+    turn_order = [seat.member for seat in game_state.players.values()]
+    game_state.rng.shuffle(turn_order)
 
-    # Send cards to players with rate limit protection
+    # Send cards to all players at once (up to DM_CONCURRENCY at a time); each player's DMs still arrive in order
     async def send_cards_to_player(player):
         """Helper function for safe_send_multiple_dms."""
         try:
-            await send_player_cards(player, game_state['players'][player]['cards'], ctx)
+            await send_player_cards(player, game_state.players[player.id].cards, ctx)
             return True
         except discord.Forbidden:
             return False
 
-    failed_players = await safe_send_multiple_dms(
-        list(game_state['players'].keys()), 
-        send_cards_to_player, 
-        delay=0.7  # Longer delay for DMs
-    )
+    failed_players = await safe_send_multiple_dms(turn_order, send_cards_to_player)
+    ensure_current_game(ctx, game_state)
     
     # Remove failed players from the game
     for player in failed_players:
-        if player in game_state['players']:
-            del game_state['players'][player]
+        seat = game_state.players.pop(player.id, None)
+        if seat is not None:
+            game_state.court_deck.extend(seat.cards)  # Their dealt cards go back into the deck
+    if failed_players:
+        game_state.rng.shuffle(game_state.court_deck)
+    
+    # Fix the seating for this game, minus anyone dropped for DM failures
+    if failed_players:
+        turn_order = [player for player in turn_order if player.id in game_state.players]
+    game_state.turn_order = turn_order
+    game_state.turn_index = 0
+    game_state.alive = {player.id: True for player in turn_order}
+    game_state.alive_count = len(turn_order)
     
     # Check if we still have enough players after DM failures
-    if len(game_state['players']) < 2:
+    if game_state.alive_count < 2:
         await send_error(ctx, "🚫 Not Enough Players", 
                         "Not enough players can receive DMs. The game requires at least 2 players with DMs enabled.")
-        game_state['game_started'] = False
+        game_state.game_started = False
         return
+    
+    game_state.current_player = turn_order[0]
 
     await send_success(ctx, "🎉 Game Started!", "Each player has been dealt 2 cards.")
     
     # Add game start to history
-    log_game_action("game_start", ctx.guild.id, list(game_state['players'].keys())[0], details=f"{len(game_state['players'])} players joined")
-    record_game_start(ctx.guild.id, list(game_state['players'].keys()))
+    log_game_action("game_start", ctx.guild.id, game_state.current_player, details=f"{len(game_state.players)} players joined")
+    record_game_start(ctx.guild.id, game_state.turn_order, game_state=game_state)
     
     # Enhanced first turn announcement
-    forced_coup = await check_forced_coup(ctx, game_state['current_player'])
+    forced_coup = await check_forced_coup(ctx, game_state.current_player, game_state=game_state)
     if not forced_coup:
-        await enhanced_turn_announcement(ctx, game_state['current_player'], is_forced_coup=False)
+        await enhanced_turn_announcement(ctx, game_state.current_player, is_forced_coup=False, game_state=game_state)
 
 @bot.command(name="end")
 async def end(ctx):
     game_state = get_game_state(ctx.guild.id)
 
-    if not game_state['game_started']:
+    if not game_state.game_started:
         await send_error(ctx, "🚫 No Game in Progress", "No game is currently in progress.")
         return
 
-    record_game_abandoned(ctx.guild.id)
-    # Reset all game variables for this guild
-    game_state['game_started'] = False
-    game_state['players'] = {}
-    game_state['current_player'] = None
-    game_state['court_deck'] = ["Duke", "Assassin", "Contessa", "Captain", "Ambassador"] * 3
-    game_state['discarded_cards'] = []  # Reset discarded cards
-    game_state['game_history'] = []  # Reset game history
-    shuffle_deck(ctx.guild.id)
+    record_game_abandoned(ctx.guild.id, game_state=game_state)
+    # Replace the game state (and its lock) instead of resetting it in place, so a command
+    # still waiting on a player can't block the guild. It keeps working on the old state it was
+    # handed, and ensure_current_game stops it after its wait instead of letting it post into
+    # the new game. Only the stats carry over.
+    fresh_state = games[ctx.guild.id] = GameState(stats=game_state.stats)
+    shuffle_deck(ctx.guild.id, game_state=fresh_state)
+    schedule_expiry(ctx.guild.id, fresh_state)
 
     await send_embed(ctx, "🛑 Game Ended",
                     "The game has been ended by an admin. All game data has been reset.",
                     discord.Color.red())
 
 @bot.command(name="income")
+@guild_locked
 async def income(ctx):
-    if not await validate_turn(ctx, ctx.author):
-        return
-    if not await validate_action_allowed(ctx, ctx.author, "income"):
+    game_state = get_game_state(ctx.guild.id)
+    if not await validate_action(ctx, "income", game_state=game_state):
         return
 
-    game_state = get_game_state(ctx.guild.id)
-    old_coins = game_state['players'][ctx.author]["coins"]
-    game_state['players'][ctx.author]["coins"] += 1
-    new_coins = game_state['players'][ctx.author]["coins"]
+    old_coins = game_state.players[ctx.author.id].coins
+    game_state.players[ctx.author.id].coins += 1
     
     log_game_action("income", ctx.guild.id, ctx.author, details="Gained 1 coin")
     
     # Enhanced visual result
-    embed = await create_embed(
+    embed = create_embed(
         "💰 INCOME COLLECTED 💰",
         create_action_result("INCOME", ctx.author),
         COLORS['gain'],
-        [{"name": "💰 Coins", "value": f"{old_coins} → **{new_coins}** (+1)", "inline": True}]
+        [{"name": "💰 Coins", "value": coin_change(old_coins, 1), "inline": True}]
     )
     await ctx.send(embed=embed)
-    await asyncio.sleep(1)
-    await advance_turn(ctx, ctx.author)
+    await asyncio.sleep(DRAMATIC_PAUSE)
+    await advance_turn(ctx, ctx.author, game_state=game_state)
 
 @bot.command(name="foreign_aid")
+@guild_locked
 async def foreign_aid(ctx):
-    if not await validate_turn(ctx, ctx.author):
-        return
-    if not await validate_action_allowed(ctx, ctx.author, "foreign_aid"):
+    game_state = get_game_state(ctx.guild.id)
+    if not await validate_action(ctx, "foreign_aid", game_state=game_state):
         return
 
-    game_state = get_game_state(ctx.guild.id)
     log_game_action("foreign_aid_attempt", ctx.guild.id, ctx.author, details="Attempted foreign aid")
     
-    fields = [{"name": "Block", "value": "React with 🚫 to block as **Duke** within 5 seconds."}]
-    action_message = await send_embed(ctx, "💸 Foreign Aid",
-                                     f"**{ctx.author.name}** is attempting to take foreign aid.",
-                                     discord.Color.blue(), fields)
+    fields = [{"name": "Block", "value": "Press 🚫 to block as **Duke** within 5 seconds."}]
+    action_embed = create_embed("💸 Foreign Aid",
+                                f"**{ctx.author.name}** is attempting to take foreign aid.",
+                                discord.Color.blue(), fields)
 
-    emoji, blocker = await wait_for_reaction(ctx, action_message, ["🚫"], action_initiator=ctx.author)
+    emoji, blocker = await wait_for_reaction(ctx, action_embed, BLOCK_EMOJIS, action_initiator=ctx.author, game_state=game_state)
 
     if emoji == "🚫":
         log_game_action("block_attempt", ctx.guild.id, blocker, ctx.author, "Blocked foreign aid as Duke")
         # Handle block attempt
-        fields = [{"name": "Challenge", "value": "React with ❓ to challenge this claim within 5 seconds."}]
-        challenge_message = await send_embed(ctx, "🛑 Block Attempt",
-                                           f"**{blocker.name}** is blocking the foreign aid as the **Duke**.",
-                                           discord.Color.orange(), fields)
+        fields = [{"name": "Challenge", "value": "Press ❓ to challenge this claim within 5 seconds."}]
+        challenge_embed = create_embed("🛑 Block Attempt",
+                                       f"**{blocker.name}** is blocking the foreign aid as the **Duke**.",
+                                       discord.Color.orange(), fields)
         
-        challenge_emoji, challenger = await wait_for_reaction(ctx, challenge_message, ["❓"], action_initiator=blocker)
+        challenge_emoji, challenger = await wait_for_reaction(ctx, challenge_embed, CHALLENGE_EMOJIS, action_initiator=blocker, game_state=game_state)
 
         if challenge_emoji == "❓":
-            claim_legitimate, game_ended, eliminated_player, next_player_result = await handle_challenge(ctx, blocker, challenger, "Duke")
+            claim_legitimate, game_ended, eliminated_player, next_player_result = await handle_challenge(ctx, blocker, challenger, "Duke", game_state=game_state)
             if game_ended:
                 return
             
@@ -1595,108 +2039,89 @@ async def foreign_aid(ctx):
                                f"**{blocker.name}**'s block succeeds, and the foreign aid is canceled.")
             else:
                 # Challenge succeeded, foreign aid proceeds
-                old_coins = game_state['players'][ctx.author]["coins"]
-                game_state['players'][ctx.author]["coins"] += 2
-                new_coins = game_state['players'][ctx.author]["coins"]
+                old_coins = game_state.players[ctx.author.id].coins
+                game_state.players[ctx.author.id].coins += 2
                 
                 log_game_action("foreign_aid_success", ctx.guild.id, ctx.author, details="Gained 2 coins after failed block")
                 
-                embed = await create_embed(
+                embed = create_embed(
                     "💸 FOREIGN AID SUCCESS! 💸",
                     create_action_result("FOREIGN AID", ctx.author),
                     COLORS['gain'],
-                    [{"name": "💰 Coins", "value": f"{old_coins} → **{new_coins}** (+2)", "inline": True}]
+                    [{"name": "💰 Coins", "value": coin_change(old_coins, 2), "inline": True}]
                 )
                 await ctx.send(embed=embed)
-                await asyncio.sleep(1)
+                await asyncio.sleep(DRAMATIC_PAUSE)
         else:
             log_game_action("foreign_aid_blocked", ctx.guild.id, ctx.author, blocker, "Foreign aid blocked by Duke (unchallenged)")
             await send_info(ctx, "🛑 Block Succeeds",
                            f"No one challenged the block. **{blocker.name}**'s block succeeds, and the foreign aid is canceled.")
     else:
         # No block, foreign aid proceeds
-        old_coins = game_state['players'][ctx.author]["coins"]
-        game_state['players'][ctx.author]["coins"] += 2
-        new_coins = game_state['players'][ctx.author]["coins"]
+        old_coins = game_state.players[ctx.author.id].coins
+        game_state.players[ctx.author.id].coins += 2
         
         log_game_action("foreign_aid_success", ctx.guild.id, ctx.author, details="Gained 2 coins (unblocked)")
         
-        embed = await create_embed(
+        embed = create_embed(
             "💸 FOREIGN AID SUCCESS! 💸",
             create_action_result("FOREIGN AID", ctx.author),
             COLORS['gain'],
-            [{"name": "💰 Coins", "value": f"{old_coins} → **{new_coins}** (+2)", "inline": True}]
+            [{"name": "💰 Coins", "value": coin_change(old_coins, 2), "inline": True}]
         )
         await ctx.send(embed=embed)
-        await asyncio.sleep(1)
+        await asyncio.sleep(DRAMATIC_PAUSE)
 
     # advance_turn now handles eliminated players safely
-    await advance_turn(ctx, ctx.author)
+    await advance_turn(ctx, ctx.author, game_state=game_state)
 
 @bot.command(name="coup")
+@guild_locked
 async def coup(ctx, target: discord.Member):
-    if not await validate_turn(ctx, ctx.author):
-        return
-    if not await validate_target(ctx, target):
-        return
-    if not await validate_self_target(ctx, ctx.author, target, "coup"):
-        return
-    if not await validate_coins(ctx, ctx.author, 7, "launch a coup"):
+    game_state = get_game_state(ctx.guild.id)
+    if not await validate_action(ctx, "coup", target=target, cost=7, cost_label="launch a coup", game_state=game_state):
         return
     
     # Extra safety check
-    game_state = get_game_state(ctx.guild.id)
-    if target not in game_state['players']:
+    if target.id not in game_state.players:
         await send_error(ctx, "🚫 Invalid Target", f"{target.name} is not in this game!")
         return
 
-    game_state = get_game_state(ctx.guild.id)
-    game_state['players'][ctx.author]["coins"] -= 7
+    game_state.players[ctx.author.id].coins -= 7
     
     # Add to history
     log_game_action("coup", ctx.guild.id, ctx.author, target, f"Paid 7 coins")
     
+    # Launch and payment in one message; lose_influence_with_reveal sets the pace from here
     await send_embed(ctx, "💥 COUP LAUNCHED!",
-                    f"**{ctx.author.name}** launches a coup against **{target.name}** for 7 coins!",
+                    f"**{ctx.author.name}** launches a coup against **{target.name}** for 7 coins!\n"
+                    f"💸 Remaining coins: **{game_state.players[ctx.author.id].coins}**",
                     discord.Color.dark_red())
-    
-    await send_embed(ctx, "💸 Payment Deducted",
-                    f"**{ctx.author.name}** pays 7 coins. Remaining coins: **{game_state['players'][ctx.author]['coins']}**",
-                    discord.Color.orange())
-    await asyncio.sleep(1)
 
-    if len(game_state['players'][target]["cards"]) > 0:
+    if game_state.alive.get(target.id):
         log_game_action("card_lost", ctx.guild.id, target, ctx.author, f"Lost card to coup")
-        card_lost = await lose_influence_with_reveal(ctx, target, "is couped and must discard")
-        await asyncio.sleep(1)
+        card_lost = await lose_influence_with_reveal(ctx, target, "is couped and must discard", game_state=game_state)
+        await asyncio.sleep(DRAMATIC_PAUSE)
         
-        eliminated, game_ended, _ = await handle_player_elimination(ctx, target)
+        eliminated, game_ended, _ = await handle_player_elimination(ctx, target, game_state=game_state)
         if game_ended:
             return
 
-    await advance_turn(ctx, ctx.author)
+    await advance_turn(ctx, ctx.author, game_state=game_state)
 
 @bot.command(name="assassinate")
+@guild_locked
 async def assassinate(ctx, target: discord.Member):
-    if not await validate_turn(ctx, ctx.author):
-        return
-    if not await validate_target(ctx, target):
-        return
-    if not await validate_self_target(ctx, ctx.author, target, "assassinate"):
-        return
-    if not await validate_coins(ctx, ctx.author, 3, "assassinate"):
-        return
-    if not await validate_action_allowed(ctx, ctx.author, "assassinate"):
+    game_state = get_game_state(ctx.guild.id)
+    if not await validate_action(ctx, "assassinate", target=target, cost=3, game_state=game_state):
         return
     
     # Extra safety check
-    game_state = get_game_state(ctx.guild.id)
-    if target not in game_state['players']:
+    if target.id not in game_state.players:
         await send_error(ctx, "🚫 Invalid Target", f"{target.name} is not in this game!")
         return
 
-    game_state = get_game_state(ctx.guild.id)
-    game_state['players'][ctx.author]["coins"] -= 3
+    game_state.players[ctx.author.id].coins -= 3
     
     # Add to history
     log_game_action("assassinate", ctx.guild.id, ctx.author, target, f"Paid 3 coins")
@@ -1706,32 +2131,31 @@ async def assassinate(ctx, target: discord.Member):
                     discord.Color.purple())
     
     fields = [{"name": "Actions Available", 
-               "value": "React with ❓ to **challenge** this Assassin claim\nReact with 🚫 to **block** as Contessa\n\nYou have 5 seconds to react."}]
-    action_message = await send_embed(ctx, "⚔️ Assassination in Progress",
-                                     f"**{ctx.author.name}** paid 3 coins to attempt assassination.",
-                                     discord.Color.orange(), fields)
+               "value": "Press ❓ to **challenge** this Assassin claim\nPress 🚫 to **block** as Contessa\n\nYou have 5 seconds to respond."}]
+    action_embed = create_embed("⚔️ Assassination in Progress",
+                                f"**{ctx.author.name}** paid 3 coins to attempt assassination.",
+                                discord.Color.orange(), fields)
 
-    emoji, reactor = await wait_for_reaction(ctx, action_message, ["❓", "🚫"], action_initiator=ctx.author)
+    emoji, reactor = await wait_for_reaction(ctx, action_embed, CHALLENGE_OR_BLOCK_EMOJIS, action_initiator=ctx.author, game_state=game_state)
 
     if emoji == "❓":
         log_game_action("assassinate_attempt", ctx.guild.id, ctx.author, target, "Assassination initiated")
         # Handle challenge to assassination claim
-        claim_legitimate, game_ended, eliminated_player, next_player_result = await handle_challenge(ctx, ctx.author, reactor, "Assassin")
+        claim_legitimate, game_ended, eliminated_player, next_player_result = await handle_challenge(ctx, ctx.author, reactor, "Assassin", game_state=game_state)
         if game_ended:
             return
         
         if claim_legitimate:
             # Challenge failed, assassination proceeds
             await send_success(ctx, "🗡️ Assassination Proceeds", "Challenge failed. The assassination proceeds.")
-            await asyncio.sleep(1)
             
             # Check if target is still alive before proceeding
-            if target in game_state['players'] and len(game_state['players'][target]["cards"]) > 0:
+            if game_state.alive.get(target.id):
                 log_game_action("assassinate_success", ctx.guild.id, ctx.author, target, "Assassination succeeded")
-                card_lost = await lose_influence_with_reveal(ctx, target, "is assassinated and must discard")
-                await asyncio.sleep(1)
+                card_lost = await lose_influence_with_reveal(ctx, target, "is assassinated and must discard", game_state=game_state)
+                await asyncio.sleep(DRAMATIC_PAUSE)
                 
-                eliminated, game_ended, _ = await handle_player_elimination(ctx, target)
+                eliminated, game_ended, _ = await handle_player_elimination(ctx, target, game_state=game_state)
                 if game_ended:
                     return
         else:
@@ -1740,26 +2164,26 @@ async def assassinate(ctx, target: discord.Member):
             # Challenge succeeded, assassination failed
             if eliminated_player == ctx.author:
                 # Current player was eliminated, advance to the calculated next player
-                game_state['current_player'] = next_player_result
+                game_state.current_player = next_player_result
                 await send_embed(ctx, "⏭️ Turn Order",
-                               f"It's now **{game_state['current_player'].mention}**'s turn.",
+                               f"It's now **{game_state.current_player.mention}**'s turn.",
                                discord.Color.blue())
             else:
-                await advance_turn(ctx, ctx.author)
+                await advance_turn(ctx, ctx.author, game_state=game_state)
             return
 
     elif emoji == "🚫":
         log_game_action("assassinate_blocked", ctx.guild.id, reactor, target, "Attempted block as Contessa")
         # Handle block attempt
-        fields = [{"name": "Challenge", "value": "React with ❓ to challenge this claim within 5 seconds."}]
-        challenge_message = await send_embed(ctx, "🛑 Block Attempt",
-                                           f"**{reactor.name}** is blocking the assassination as **Contessa**.",
-                                           discord.Color.orange(), fields)
+        fields = [{"name": "Challenge", "value": "Press ❓ to challenge this claim within 5 seconds."}]
+        challenge_embed = create_embed("🛑 Block Attempt",
+                                       f"**{reactor.name}** is blocking the assassination as **Contessa**.",
+                                       discord.Color.orange(), fields)
 
-        challenge_emoji, challenger = await wait_for_reaction(ctx, challenge_message, ["❓"], action_initiator=reactor)
+        challenge_emoji, challenger = await wait_for_reaction(ctx, challenge_embed, CHALLENGE_EMOJIS, action_initiator=reactor, game_state=game_state)
 
         if challenge_emoji == "❓":
-            claim_legitimate, game_ended, eliminated_player, next_player_result = await handle_challenge(ctx, reactor, challenger, "Contessa")
+            claim_legitimate, game_ended, eliminated_player, next_player_result = await handle_challenge(ctx, reactor, challenger, "Contessa", game_state=game_state)
             if game_ended:
                 return
             
@@ -1775,12 +2199,12 @@ async def assassinate(ctx, target: discord.Member):
                                discord.Color.red())
                 
                 # Check if target is still alive and in the game before proceeding
-                if target in game_state['players'] and len(game_state['players'][target]["cards"]) > 0:
+                if game_state.alive.get(target.id):
                     log_game_action("assassinate_success", ctx.guild.id, ctx.author, target, "Assassination succeeded")
-                    card_lost = await lose_influence_with_reveal(ctx, target, "is assassinated and must discard")
-                    await asyncio.sleep(1)
+                    card_lost = await lose_influence_with_reveal(ctx, target, "is assassinated and must discard", game_state=game_state)
+                    await asyncio.sleep(DRAMATIC_PAUSE)
                     
-                    eliminated, game_ended, _ = await handle_player_elimination(ctx, target)
+                    eliminated, game_ended, _ = await handle_player_elimination(ctx, target, game_state=game_state)
                     if game_ended:
                         return
                 else:
@@ -1795,127 +2219,137 @@ async def assassinate(ctx, target: discord.Member):
     else:
         # No block or challenge, assassination proceeds
         await send_success(ctx, "🗡️ Assassination Proceeds", "No one blocked the assassination. Action proceeds.")
-        await asyncio.sleep(1)
 
         # Check if target is still alive before proceeding
-        if target in game_state['players'] and len(game_state['players'][target]["cards"]) > 0:
+        if game_state.alive.get(target.id):
             log_game_action("assassinate_success", ctx.guild.id, ctx.author, target, "Assassination succeeded")
-            card_lost = await lose_influence_with_reveal(ctx, target, "is assassinated and must discard")
-            await asyncio.sleep(1)
+            card_lost = await lose_influence_with_reveal(ctx, target, "is assassinated and must discard", game_state=game_state)
+            await asyncio.sleep(DRAMATIC_PAUSE)
             
-            eliminated, game_ended, _ = await handle_player_elimination(ctx, target)
+            eliminated, game_ended, _ = await handle_player_elimination(ctx, target, game_state=game_state)
             if game_ended:
                 return
 
     # Always advance turn at the end, regardless of what happened
-    await advance_turn(ctx, ctx.author)
+    await advance_turn(ctx, ctx.author, game_state=game_state)
 
 @bot.command(name="tax")
+@guild_locked
 async def tax(ctx):
-    if not await validate_turn(ctx, ctx.author):
-        return
-    if not await validate_action_allowed(ctx, ctx.author, "tax"):
+    game_state = get_game_state(ctx.guild.id)
+    if not await validate_action(ctx, "tax", game_state=game_state):
         return
 
     log_game_action("tax_attempt", ctx.guild.id, ctx.author, details="Claimed Duke for 3 coins")
-    game_state = get_game_state(ctx.guild.id)
-    fields = [{"name": "Challenge", "value": "React with ❓ to challenge this claim within 5 seconds."}]
-    action_message = await send_embed(ctx, "💰 Tax Claim",
-                                     f"{ctx.author.name} is claiming the **Duke** to take 3 coins.",
-                                     discord.Color.blue(), fields)
+    fields = [{"name": "Challenge", "value": "Press ❓ to challenge this claim within 5 seconds."}]
+    action_embed = create_embed("💰 Tax Claim",
+                                f"{ctx.author.name} is claiming the **Duke** to take 3 coins.",
+                                discord.Color.blue(), fields)
 
-    emoji, challenger = await wait_for_reaction(ctx, action_message, ["❓"], action_initiator=ctx.author)
+    emoji, challenger = await wait_for_reaction(ctx, action_embed, CHALLENGE_EMOJIS, action_initiator=ctx.author, game_state=game_state)
 
     if emoji == "❓":
-        claim_legitimate, game_ended, eliminated_player, next_player_result = await handle_challenge(ctx, ctx.author, challenger, "Duke")
+        claim_legitimate, game_ended, eliminated_player, next_player_result = await handle_challenge(ctx, ctx.author, challenger, "Duke", game_state=game_state)
         if game_ended:
             return
         
         if claim_legitimate:
             # Challenge failed, tax proceeds
-            game_state['players'][ctx.author]["coins"] += 3
-            log_game_action("tax_success", ctx.guild.id, ctx.author, details=f"Gained 3 coins, now has {game_state['players'][ctx.author]['coins']}")
-            await send_embed(ctx, "💰 Coins Updated",
-                           f"{ctx.author.name} now has **{game_state['players'][ctx.author]['coins']}** coins.",
-                           discord.Color.green())
-            await asyncio.sleep(1)
+            outcome, log_suffix = "The challenge failed. Action proceeds.", ""
         else:
             # Challenge succeeded, turn advances
             log_game_action("tax_failed", ctx.guild.id, ctx.author, challenger, "Challenge succeeded - no Duke card")
             log_game_action("false_duke_exposed", ctx.guild.id, ctx.author, challenger, "Caught bluffing Duke claim")
             if eliminated_player == ctx.author:
                 # Current player was eliminated, advance to the calculated next player
-                game_state['current_player'] = next_player_result
+                game_state.current_player = next_player_result
                 await send_embed(ctx, "⏭️ Turn Order",
-                               f"It's now **{game_state['current_player'].mention}**'s turn.",
+                               f"It's now **{game_state.current_player.mention}**'s turn.",
                                discord.Color.blue())
             else:
-                await advance_turn(ctx, ctx.author)
+                await advance_turn(ctx, ctx.author, game_state=game_state)
             return
     else:
         # No challenge, tax proceeds
-        log_game_action("tax_success", ctx.guild.id, ctx.author, details=f"Gained 3 coins unchallenged, now has {game_state['players'][ctx.author]['coins']}")
-        await send_success(ctx, "💰 Tax Proceeds", "No one challenged the claim. Action proceeds.")
-        await asyncio.sleep(1)
-        game_state['players'][ctx.author]["coins"] += 3
-        await send_embed(ctx, "💰 Coins Updated",
-                        f"{ctx.author.name} now has **{game_state['players'][ctx.author]['coins']}** coins.",
-                        discord.Color.green())
-        await asyncio.sleep(1)
-
-    await advance_turn(ctx, ctx.author)
+        outcome, log_suffix = "No one challenged the claim. Action proceeds.", " unchallenged"
+    
+    # One message for the result and the new balance; the turn announcement follows straight on
+    me = game_state.players[ctx.author.id]
+    me.coins += 3
+    log_game_action("tax_success", ctx.guild.id, ctx.author, details=f"Gained 3 coins{log_suffix}, now has {me.coins}")
+    await send_embed(ctx, "💰 Tax Proceeds",
+                    f"{outcome}\n**{ctx.author.name}** now has **{me.coins}** coins.",
+                    COLORS['gain'])
+
+    await advance_turn(ctx, ctx.author, game_state=game_state)
+
+async def _apply_successful_steal(ctx, target, game_state, context):
+    """Move up to 2 coins from target to the stealer, log it and announce the result."""
+    players = game_state.players
+    me = players[ctx.author.id]
+    victim = players[target.id]
+    old_coins_stealer = me.coins
+    old_coins_target = victim.coins
+    
+    stolen_coins = 2 if old_coins_target >= 2 else old_coins_target
+    me.coins = old_coins_stealer + stolen_coins
+    victim.coins = old_coins_target - stolen_coins
+    log_game_action("steal_success", ctx.guild.id, ctx.author, target, f"{context}, stealing {stolen_coins} coins")
+
+    embed = create_embed(
+        "💸 STEAL SUCCESSFUL! 💸",
+        create_action_result("STEAL", ctx.author, target, f"{stolen_coins} coins stolen"),
+        COLORS['gain'],
+        [{"name": f"👤 {ctx.author.name}", "value": coin_change(old_coins_stealer, stolen_coins), "inline": True},
+         {"name": f"👤 {target.name}", "value": coin_change(old_coins_target, -stolen_coins), "inline": True}]
+    )
+    await ctx.send(embed=embed)
 
 @bot.command(name="steal")
+@guild_locked
 async def steal(ctx, target: discord.Member):
-    if not await validate_turn(ctx, ctx.author):
-        return
-    if not await validate_target(ctx, target):
-        return
-    if not await validate_self_target(ctx, ctx.author, target, "steal"):
-        return
-    if not await validate_action_allowed(ctx, ctx.author, "steal"):
+    game_state = get_game_state(ctx.guild.id)
+    if not await validate_action(ctx, "steal", target=target, game_state=game_state):
         return
+    players = game_state.players
 
     # Extra safety check
-    game_state = get_game_state(ctx.guild.id)
-    if target not in game_state['players']:
+    if target.id not in players:
         await send_error(ctx, "🚫 Invalid Target", f"{target.name} is not in this game!")
         return
-
-    game_state = get_game_state(ctx.guild.id)
     
-    if game_state['players'][target]["coins"] < 1:
+    if players[target.id].coins < 1:
         await send_error(ctx, "💸 No Coins to Steal", f"{target.name} has no coins to steal!")
         return
 
     log_game_action("steal_attempt", ctx.guild.id, ctx.author, target, f"Claimed Captain to steal from {target.name}")
     fields = [{"name": "Your Options", 
-               "value": "🚫 - Block as **Captain** or **Ambassador**\n❓ - Challenge **Captain** claim\n\nReact within 5 seconds to take action."}]
-    action_message = await send_embed(ctx, "💰 Steal Attempt",
-                                     f"{ctx.author.name} is attempting to steal from {target.name} as **Captain**.",
-                                     discord.Color.blue(), fields)
+               "value": "🚫 - Block as **Captain** or **Ambassador**\n❓ - Challenge **Captain** claim\n\nPress a button within 5 seconds to take action."}]
+    action_embed = create_embed("💰 Steal Attempt",
+                                f"{ctx.author.name} is attempting to steal from {target.name} as **Captain**.",
+                                discord.Color.blue(), fields)
 
-    emoji, reactor = await wait_for_reaction(ctx, action_message, ["🚫", "❓"], action_initiator=ctx.author)
+    emoji, reactor = await wait_for_reaction(ctx, action_embed, CHALLENGE_OR_BLOCK_EMOJIS, action_initiator=ctx.author, game_state=game_state)
 
     if emoji == "🚫":
         # Handle block attempt
         log_game_action("steal_blocked", ctx.guild.id, reactor, ctx.author, "Attempted block as Captain/Ambassador")
-        fields = [{"name": "Challenge", "value": "React with ❓ to challenge this block within 5 seconds."}]
-        challenge_message = await send_embed(ctx, "🔒 Block Attempt",
-                                           f"{reactor.name} is attempting to block the steal as **Captain** or **Ambassador**!",
-                                           discord.Color.orange(), fields)
-        challenge_emoji, challenger = await wait_for_reaction(ctx, challenge_message, ["❓"], action_initiator=reactor)
+        fields = [{"name": "Challenge", "value": "Press ❓ to challenge this block within 5 seconds."}]
+        challenge_embed = create_embed("🔒 Block Attempt",
+                                       f"{reactor.name} is attempting to block the steal as **Captain** or **Ambassador**!",
+                                       discord.Color.orange(), fields)
+        challenge_emoji, challenger = await wait_for_reaction(ctx, challenge_embed, CHALLENGE_EMOJIS, action_initiator=reactor, game_state=game_state)
 
         if challenge_emoji == "❓":
             log_game_action("block_challenged", ctx.guild.id, challenger, reactor, "Challenged Captain/Ambassador block claim")
             # Use dramatic block challenge
-            claim_legitimate, game_ended, eliminated_player, next_player_result = await handle_block_challenge(ctx, reactor, challenger, ["Captain", "Ambassador"])
+            claim_legitimate, game_ended, eliminated_player, next_player_result = await handle_block_challenge(ctx, reactor, challenger, ["Captain", "Ambassador"], game_state=game_state)
             if game_ended:
                 return
             
             if claim_legitimate:
                 # Block succeeded
-                embed = await create_embed(
+                embed = create_embed(
                     "🛡️ BLOCK SUCCESSFUL! 🛡️",
                     f"**{reactor.name}** successfully blocks the steal!",
                     COLORS['success']
@@ -1924,25 +2358,10 @@ async def steal(ctx, target: discord.Member):
             else:
                 # Block failed, steal proceeds
                 # Check if target is still in the game before proceeding with steal
-                if target in game_state['players'] and len(game_state['players'][target]["cards"]) > 0:
+                if game_state.alive.get(target.id):
                     # Steal proceeds after failed block
-                    old_coins_stealer = game_state['players'][ctx.author]["coins"]
-                    old_coins_target = game_state['players'][target]["coins"]
-                    
-                    stolen_coins = min(2, game_state['players'][target]["coins"])
-                    game_state['players'][ctx.author]["coins"] += stolen_coins
-                    game_state['players'][target]["coins"] -= stolen_coins
-                    log_game_action("steal_success", ctx.guild.id, ctx.author, target, f"Block failed, stealing {stolen_coins} coins")
+                    await _apply_successful_steal(ctx, target, game_state, "Block failed")
                     log_game_action("false_block_exposed", ctx.guild.id, reactor, challenger, "Caught bluffing Captain/Ambassador block")
-
-                    embed = await create_embed(
-                        "💸 STEAL SUCCESSFUL! 💸",
-                        create_action_result("STEAL", ctx.author, target, f"{stolen_coins} coins stolen"),
-                        COLORS['gain'],
-                        [{"name": f"👤 {ctx.author.name}", "value": f"{old_coins_stealer} → **{game_state['players'][ctx.author]['coins']}** (+{stolen_coins})", "inline": True},
-                         {"name": f"👤 {target.name}", "value": f"{old_coins_target} → **{game_state['players'][target]['coins']}** (-{stolen_coins})", "inline": True}]
-                    )
-                    await ctx.send(embed=embed)
                 else:
                     # Target was already eliminated
                     await send_embed(ctx, "💀 Target Already Eliminated",
@@ -1951,7 +2370,7 @@ async def steal(ctx, target: discord.Member):
         else:
             # Block not challenged - it succeeds
             log_game_action("steal_failed", ctx.guild.id, ctx.author, target, "Blocked by Captain/Ambassador")
-            embed = await create_embed(
+            embed = create_embed(
                 "🛡️ BLOCK SUCCESSFUL! 🛡️",
                 f"**{reactor.name}** successfully blocks the steal!",
                 COLORS['success']
@@ -1961,30 +2380,15 @@ async def steal(ctx, target: discord.Member):
     elif emoji == "❓":
         log_game_action("steal_challenged", ctx.guild.id, reactor, ctx.author, "Challenged Captain claim")
         # Handle direct challenge to steal action
-        claim_legitimate, game_ended, eliminated_player, next_player_result = await handle_challenge(ctx, ctx.author, reactor, "Captain")
+        claim_legitimate, game_ended, eliminated_player, next_player_result = await handle_challenge(ctx, ctx.author, reactor, "Captain", game_state=game_state)
         if game_ended:
             return
         
         if claim_legitimate:
             # Check if target is still in the game before proceeding
-            if target in game_state['players'] and len(game_state['players'][target]["cards"]) > 0:
+            if game_state.alive.get(target.id):
                 # Steal proceeds after successful challenge defense
-                old_coins_stealer = game_state['players'][ctx.author]["coins"]
-                old_coins_target = game_state['players'][target]["coins"]
-                
-                stolen_coins = min(2, game_state['players'][target]["coins"])
-                game_state['players'][ctx.author]["coins"] += stolen_coins
-                game_state['players'][target]["coins"] -= stolen_coins
-                log_game_action("steal_success", ctx.guild.id, ctx.author, target, f"Challenge failed, stealing {stolen_coins} coins")
-
-                embed = await create_embed(
-                    "💸 STEAL SUCCESSFUL! 💸",
-                    create_action_result("STEAL", ctx.author, target, f"{stolen_coins} coins stolen"),
-                    COLORS['gain'],
-                    [{"name": f"👤 {ctx.author.name}", "value": f"{old_coins_stealer} → **{game_state['players'][ctx.author]['coins']}** (+{stolen_coins})", "inline": True},
-                     {"name": f"👤 {target.name}", "value": f"{old_coins_target} → **{game_state['players'][target]['coins']}** (-{stolen_coins})", "inline": True}]
-                )
-                await ctx.send(embed=embed)
+                await _apply_successful_steal(ctx, target, game_state, "Challenge failed")
             else:
                 # Target no longer exists
                 await send_embed(ctx, "💀 Target No Longer Available",
@@ -1996,31 +2400,15 @@ async def steal(ctx, target: discord.Member):
             log_game_action("false_captain_exposed", ctx.guild.id, ctx.author, reactor, "Caught bluffing Captain claim")
             if eliminated_player == ctx.author:
                 # Current player was eliminated, advance to the calculated next player
-                game_state['current_player'] = next_player_result
-                await enhanced_turn_announcement(ctx, game_state['current_player'])
+                game_state.current_player = next_player_result
+                await enhanced_turn_announcement(ctx, game_state.current_player, game_state=game_state)
                 return
             # If current player wasn't eliminated, continue to end and advance normally
     else:
         # No reaction - steal proceeds unchallenged
         # Check if target is still in the game before proceeding
-        if target in game_state['players'] and len(game_state['players'][target]["cards"]) > 0:
-            old_coins_stealer = game_state['players'][ctx.author]["coins"]
-            old_coins_target = game_state['players'][target]["coins"]
-            
-            stolen_coins = min(2, game_state['players'][target]["coins"])
-            game_state['players'][ctx.author]["coins"] += stolen_coins
-            game_state['players'][target]["coins"] -= stolen_coins
-
-            log_game_action("steal_success", ctx.guild.id, ctx.author, target, f"Unchallenged, stealing {stolen_coins} coins")
-
-            embed = await create_embed(
-                "💸 STEAL SUCCESSFUL! 💸",
-                create_action_result("STEAL", ctx.author, target, f"{stolen_coins} coins stolen"),
-                COLORS['gain'],
-                [{"name": f"👤 {ctx.author.name}", "value": f"{old_coins_stealer} → **{game_state['players'][ctx.author]['coins']}** (+{stolen_coins})", "inline": True},
-                 {"name": f"👤 {target.name}", "value": f"{old_coins_target} → **{game_state['players'][target]['coins']}** (-{stolen_coins})", "inline": True}]
-            )
-            await ctx.send(embed=embed)
+        if game_state.alive.get(target.id):
+            await _apply_successful_steal(ctx, target, game_state, "Unchallenged")
         else:
             # Target no longer exists
             await send_embed(ctx, "💀 Target No Longer Available",
@@ -2028,31 +2416,43 @@ async def steal(ctx, target: discord.Member):
                            discord.Color.red())
 
     # Always advance turn at the end (unless current player was eliminated above)
-    await advance_turn(ctx, ctx.author)
+    await advance_turn(ctx, ctx.author, game_state=game_state)
+
+@functools.lru_cache(maxsize=32)
+def _card_option_embed(option, card):
+    """Exchange DM embed for one pick; at most 4 options × 5 cards exist, so each is built once."""
+    return create_embed(
+        f"Option {option}: {card}",
+        f"**{card}** - React with {option}️⃣ to select this card",
+        discord.Color.blue(),
+        image_url=card_images[card]
+    )
+
+EXCHANGE_PICK_TIMEOUT = 60  # Seconds allowed per card pick before the exchange is called off
 
 @bot.command(name="exchange")
+@guild_locked
 async def exchange(ctx):
-    if not await validate_turn(ctx, ctx.author):
-        return
-    if not await validate_action_allowed(ctx, ctx.author, "exchange"):
-        return
-
     game_state = get_game_state(ctx.guild.id)
+    if not await validate_action(ctx, "exchange", game_state=game_state):
+        return
+    
+    me = game_state.players[ctx.author.id]
     
     # Get initial card count at the beginning
-    initial_card_count = len(game_state['players'][ctx.author]["cards"])
+    initial_card_count = len(me.cards)
     log_game_action("exchange_attempt", ctx.guild.id, ctx.author, details="Claimed Ambassador to exchange cards")
 
-    fields = [{"name": "Challenge", "value": "React with ❓ to challenge this claim within 5 seconds."}]
-    action_message = await send_embed(ctx, "🔄 Exchange Action",
-                                     f"{ctx.author.name} is attempting to exchange cards as the **Ambassador**.",
-                                     discord.Color.blue(), fields)
+    fields = [{"name": "Challenge", "value": "Press ❓ to challenge this claim within 5 seconds."}]
+    action_embed = create_embed("🔄 Exchange Action",
+                                f"{ctx.author.name} is attempting to exchange cards as the **Ambassador**.",
+                                discord.Color.blue(), fields)
 
-    emoji, challenger = await wait_for_reaction(ctx, action_message, ["❓"], action_initiator=ctx.author)
+    emoji, challenger = await wait_for_reaction(ctx, action_embed, CHALLENGE_EMOJIS, action_initiator=ctx.author, game_state=game_state)
 
     if emoji == "❓":
         log_game_action("exchange_challenged", ctx.guild.id, challenger, ctx.author, "Challenged Ambassador claim")
-        claim_legitimate, game_ended, eliminated_player, next_player_result = await handle_challenge(ctx, ctx.author, challenger, "Ambassador")
+        claim_legitimate, game_ended, eliminated_player, next_player_result = await handle_challenge(ctx, ctx.author, challenger, "Ambassador", game_state=game_state)
         if game_ended:
             return
         
@@ -2062,82 +2462,60 @@ async def exchange(ctx):
             # Challenge succeeded, exchange failed
             if eliminated_player == ctx.author:
                 # Current player was eliminated, advance to the calculated next player
-                game_state['current_player'] = next_player_result
+                game_state.current_player = next_player_result
                 await send_embed(ctx, "⏭️ Turn Order",
-                               f"It's now **{game_state['current_player'].mention}**'s turn.",
+                               f"It's now **{game_state.current_player.mention}**'s turn.",
                                discord.Color.blue())
             else:
                 # Current player wasn't eliminated, advance normally
-                await advance_turn(ctx, ctx.author)
+                await advance_turn(ctx, ctx.author, game_state=game_state)
             return
 
     log_game_action("exchange_proceeding", ctx.guild.id, ctx.author, details="Exchange proceeding after challenge phase")
     # Exchange proceeds
     await send_info(ctx, "🔄 Exchange Proceeds", 
                    "No one challenged the claim or the challenge failed. Action proceeds.")
-    await asyncio.sleep(1)
+    await asyncio.sleep(DRAMATIC_PAUSE)
 
     # Draw 2 cards from the Court Deck
-    if len(game_state['court_deck']) < 2:
-        logger.error(f"DECK_ERROR: Not enough cards for exchange! Deck has {len(game_state['court_deck'])} cards")
+    if len(game_state.court_deck) < 2:
+        logger.error(f"DECK_ERROR: Not enough cards for exchange! Deck has {len(game_state.court_deck)} cards")
         await send_error(ctx, "🚫 Deck Error", 
                         "Not enough cards remaining in the deck for exchange! This shouldn't happen - please contact an admin.")
-        await advance_turn(ctx, ctx.author)
+        await advance_turn(ctx, ctx.author, game_state=game_state)
         return
 
-    new_cards = [game_state['court_deck'].pop(), game_state['court_deck'].pop()]
-    all_cards = game_state['players'][ctx.author]["cards"] + new_cards
+    deck = game_state.court_deck
+    new_cards = deck[-2:]
+    del deck[-2:]
     log_game_action("exchange_cards_drawn", ctx.guild.id, ctx.author, details=f"Drew {len(new_cards)} cards from deck")
     
-    # Randomize the order so players can't tell which are their old cards
-    random.shuffle(all_cards)
-    all_cards_with_ids = [(card, f"{card} ({i+1})") for i, card in enumerate(all_cards)]
+    # Pool hand and draws in a random order so players can't tell which are their old cards
+    pool = me.cards + new_cards
+    all_cards = game_state.rng.sample(pool, len(pool))
 
-    # Send the drawn cards to the player via DM
-    dm_success = True
+    # Send the drawn cards to the player as one DM: header, one embed per option, instructions
     try:
-        # Send header for exchange
-        header_embed = await create_embed(
+        header_embed = create_embed(
             "🔄 Exchange Cards Available", 
             f"You drew 2 cards from the deck. Choose **{initial_card_count}** cards to keep:",
             discord.Color.purple()
         )
-        success, error_reason = await safe_send_dm(ctx.author, header_embed)
-        if not success:
-            dm_success = False
-        
-        # Send each card option with image
-        if dm_success:
-            for i, (card, card_id) in enumerate(all_cards_with_ids, 1):
-                card_embed = await create_embed(
-                    f"Option {i}: {card}",
-                    f"**{card}** - React with {i}️⃣ to select this card",
-                    discord.Color.blue(),
-                    image_url=card_images[card]
-                )
-                success, error_reason = await safe_send_dm(ctx.author, card_embed)
-                if not success:
-                    dm_success = False
-                    break
-        
-        # Send footer with instructions
-        if dm_success:
-            footer_embed = await create_embed(
-                "📋 Instructions",
-                f"React to the message in the channel with the numbers for the cards you want to keep.\n\nYou need to select **{initial_card_count}** cards total.",
-                discord.Color.gold()
-            )
-            footer_embed.set_footer(text="Choose wisely! This could change your strategy! 🎯")
-            success, error_reason = await safe_send_dm(ctx.author, footer_embed)
-            if not success:
-                dm_success = False
+        option_embeds = [_card_option_embed(i, card) for i, card in enumerate(all_cards, 1)]
+        footer_embed = create_embed(
+            "📋 Instructions",
+            f"React to the message in the channel with the numbers for the cards you want to keep.\n\nYou need to select **{initial_card_count}** cards total.",
+            discord.Color.gold()
+        )
+        footer_embed.set_footer(text="Choose wisely! This could change your strategy! 🎯")
+        dm_success, error_reason = await safe_send_dm(ctx.author, [header_embed, *option_embeds, footer_embed])
         
         if not dm_success:
             log_game_action("exchange_dm_failed", ctx.guild.id, ctx.author, details="Could not send exchange cards via DM")
             await handle_dm_failure(ctx, ctx.author, error_reason, "receive exchange card options")
             # Return cards to deck and advance turn
-            game_state['court_deck'].extend(new_cards)
-            await advance_turn(ctx, ctx.author)
+            game_state.court_deck.extend(new_cards)
+            await advance_turn(ctx, ctx.author, game_state=game_state)
             return
             
     except Exception as e:
@@ -2145,144 +2523,155 @@ async def exchange(ctx):
         await send_error(ctx, "⚠️ Exchange Error", 
                         f"An error occurred during the exchange: {str(e)}")
         # Return cards to deck and advance turn
-        game_state['court_deck'].extend(new_cards)
-        await advance_turn(ctx, ctx.author)
+        game_state.court_deck.extend(new_cards)
+        await advance_turn(ctx, ctx.author, game_state=game_state)
         return
 
     # Display the cards in the server and ask for reactions
-    embed = await create_embed("🃏 Choose Your Cards",
+    embed = create_embed("🃏 Choose Your Cards",
                               "Check your DMs for the cards drawn and react with the corresponding emoji to choose your cards.",
                               discord.Color.purple())
     card_message = await ctx.send(embed=embed)
 
-    # Add reactions for each card
+    # Add reactions for each card, in number order
     valid_emojis = ["1️⃣", "2️⃣", "3️⃣", "4️⃣"]
-    for i in range(len(all_cards_with_ids)):
-        await card_message.add_reaction(valid_emojis[i])
+    await safe_add_reactions(card_message, valid_emojis[:len(all_cards)], ordered=True)
 
     # Wait for the player to react
     chosen_cards = []
-    selected_indices = []
+    selected_indices = set()
 
-    while len(chosen_cards) < initial_card_count:
-        def check(reaction, user):
-            return user == ctx.author and str(reaction.emoji) in valid_emojis and reaction.message.id == card_message.id
+    # Built once for the whole pick loop; only the offered numbers count
+    option_index = {emoji: i for i, emoji in enumerate(valid_emojis[:len(all_cards)])}
+    card_message_id = card_message.id
+    author_id = ctx.author.id
 
-        reaction, user = await bot.wait_for("reaction_add", check=check)
-        card_index = valid_emojis.index(str(reaction.emoji))
+    def check(reaction, user):
+        # Cheapest, most selective test first: most reaction events are for other messages
+        return reaction.message.id == card_message_id and user.id == author_id and str(reaction.emoji) in option_index
+
+    while len(chosen_cards) < initial_card_count:
+        try:
+            reaction, user = await bot.wait_for("reaction_add", check=check, timeout=EXCHANGE_PICK_TIMEOUT)
+            ensure_current_game(ctx, game_state)
+        except asyncio.TimeoutError:
+            ensure_current_game(ctx, game_state)
+            # The command holds the guild lock, so an AFK player can't stall the game:
+            # keep the original hand and put both drawn cards back
+            game_state.court_deck.extend(new_cards)
+            log_game_action("exchange_timeout", ctx.guild.id, ctx.author, details="No pick in time, kept original cards")
+            await send_info(ctx, "⏰ Exchange Timed Out",
+                            f"{ctx.author.name} didn't pick in time and keeps their original cards.")
+            await advance_turn(ctx, ctx.author, game_state=game_state)
+            return
+        card_index = option_index[str(reaction.emoji)]
 
         if card_index not in selected_indices:
-            selected_indices.append(card_index)
-            chosen_card = all_cards_with_ids[card_index][0]
+            selected_indices.add(card_index)
+            chosen_card = all_cards[card_index]
             chosen_cards.append(chosen_card)
 
     # Update the player's cards
-    game_state['players'][ctx.author]["cards"] = chosen_cards
+    me.cards = chosen_cards
 
     # Return the unchosen cards to the Court Deck - FIXED VERSION
     # Use indices to properly track which specific cards were chosen vs unchosen
-    unchosen_cards = []
-    for i, (card, card_id) in enumerate(all_cards_with_ids):
-        if i not in selected_indices:
-            unchosen_cards.append(card)
+    unchosen_cards = [card for i, card in enumerate(all_cards) if i not in selected_indices]
     
-    game_state['court_deck'].extend(unchosen_cards)
+    game_state.court_deck.extend(unchosen_cards)
     log_game_action("exchange_cards_returned", ctx.guild.id, ctx.author, details=f"Returned {len(unchosen_cards)} cards to deck")
 
     await send_success(ctx, "🔄 Exchange Complete", "The exchange is now complete.")
-    await asyncio.sleep(1)
-    await advance_turn(ctx, ctx.author)
-
-@bot.command(name="actions")
-async def actions(ctx):
-    """Display all available actions with enhanced styling."""
-    # Create main embed with general title
-    title = "📋 ═══ COUP ACTIONS GUIDE ═══ 📋"
-    color = discord.Color.blue()
+    await asyncio.sleep(DRAMATIC_PAUSE)
+    await advance_turn(ctx, ctx.author, game_state=game_state)
 
-    embed = discord.Embed(title=title, color=color)
-    
-    # General Actions - Always Available
-    general_actions = ""
-    
+# !actions guide text; static, so each field is joined once at import
+_GENERAL_ACTIONS_TEXT = "\n".join([
     # Income
-    general_actions += "💰 `!income` - **Take 1 coin**\n"
-    general_actions += "└ Safe action, cannot be blocked or challenged\n"
-    general_actions += "└ Use when you want to play it safe\n\n"
-    
+    "💰 `!income` - **Take 1 coin**",
+    "└ Safe action, cannot be blocked or challenged",
+    "└ Use when you want to play it safe",
+    "",
     # Foreign Aid
-    general_actions += "💸 `!foreign_aid` - **Take 2 coins**\n"
-    general_actions += "└ Can be blocked by players claiming 👑 **Duke**\n"
-    general_actions += "└ Good for building wealth quickly\n\n"
-    
+    "💸 `!foreign_aid` - **Take 2 coins**",
+    "└ Can be blocked by players claiming 👑 **Duke**",
+    "└ Good for building wealth quickly",
+    "",
     # Coup
-    general_actions += "💥 `!coup <target>` - **Launch a coup** (7 coins)\n"
-    general_actions += "└ Eliminates one of target's cards\n"
-    general_actions += "└ Cannot be blocked or challenged\n"
-    general_actions += "└ Required when you have 10+ coins!"
+    "💥 `!coup <target>` - **Launch a coup** (7 coins)",
+    "└ Eliminates one of target's cards",
+    "└ Cannot be blocked or challenged",
+    "└ Required when you have 10+ coins!",
+])
 
-    embed.add_field(
-        name="🎯 __General Actions__",
-        value=general_actions,
-        inline=False
-    )
-
-    # Character-Specific Actions
-    character_actions = ""
-    
+_CHARACTER_ACTIONS_TEXT = "\n".join([
     # Duke - Tax
-    character_actions += "👑 `!tax` - **Take 3 coins as Duke**\n"
-    character_actions += "└ Can be challenged if you don't have Duke\n"
-    character_actions += "└ Great for building wealth fast\n\n"
-    
+    "👑 `!tax` - **Take 3 coins as Duke**",
+    "└ Can be challenged if you don't have Duke",
+    "└ Great for building wealth fast",
+    "",
     # Assassin - Assassinate
-    character_actions += "🗡️ `!assassinate <target>` - **Eliminate for 3 coins as Assassin**\n"
-    character_actions += "└ Can be challenged if you don't have Assassin\n"
-    character_actions += "└ Can be blocked by players claiming Contessa\n"
-    character_actions += "└ Cheaper than coup!\n\n"
-    
+    "🗡️ `!assassinate <target>` - **Eliminate for 3 coins as Assassin**",
+    "└ Can be challenged if you don't have Assassin",
+    "└ Can be blocked by players claiming Contessa",
+    "└ Cheaper than coup!",
+    "",
     # Captain - Steal
-    character_actions += "⚓ `!steal <target>` - **Steal 2 coins as Captain**\n"
-    character_actions += "└ Can be challenged if you don't have Captain\n"
-    character_actions += "└ Can be blocked by Captain or Ambassador\n"
-    character_actions += "└ Gain coins while weakening opponents\n\n"
-    
+    "⚓ `!steal <target>` - **Steal 2 coins as Captain**",
+    "└ Can be challenged if you don't have Captain",
+    "└ Can be blocked by Captain or Ambassador",
+    "└ Gain coins while weakening opponents",
+    "",
     # Ambassador - Exchange
-    character_actions += "🤝 `!exchange` - **Exchange cards as Ambassador**\n"
-    character_actions += "└ Can be challenged if you don't have Ambassador\n"
-    character_actions += "└ Draw 2 cards, keep the same amount you had\n"
-    character_actions += "└ Get better cards for your strategy"
-
-    embed.add_field(
-        name="🃏 __Character Actions__",
-        value=character_actions,
-        inline=False
-    )
-
-    # Defensive Actions
-    defensive_actions = "└ **Block Foreign Aid** - Claim 👑 Duke to stop others' foreign aid\n"
-    defensive_actions += "└ **Block Assassination** - Claim 🛡️ Contessa to stop assassinations\n"
-    defensive_actions += "└ **Block Stealing** - Claim ⚓ Captain or 🤝 Ambassador to stop theft\n"
-    defensive_actions += "└ **Challenge Claims** - Challenge others' character claims\n\n"
-
-    embed.add_field(
-        name="🛡️ __Defensive Actions__",
-        value=defensive_actions,
-        inline=False
-    )
-
-    # Add the Coup actions reference image
-    embed.set_image(url="https://static.wikia.nocookie.net/board-games-galore/images/2/2d/Coup_actions.jpg/revision/latest?cb=20160713201921")
+    "🤝 `!exchange` - **Exchange cards as Ambassador**",
+    "└ Can be challenged if you don't have Ambassador",
+    "└ Draw 2 cards, keep the same amount you had",
+    "└ Get better cards for your strategy",
+])
+
+_DEFENSIVE_ACTIONS_TEXT = "\n".join([
+    "└ **Block Foreign Aid** - Claim 👑 Duke to stop others' foreign aid",
+    "└ **Block Assassination** - Claim 🛡️ Contessa to stop assassinations",
+    "└ **Block Stealing** - Claim ⚓ Captain or 🤝 Ambassador to stop theft",
+    "└ **Challenge Claims** - Challenge others' character claims",
+])
+
+# The !actions guide embed, built once; the command copies it and stamps the time
+_ACTIONS_EMBED_TEMPLATE = discord.Embed(title="📋 ═══ COUP ACTIONS GUIDE ═══ 📋", color=discord.Color.blue())
+
+_ACTIONS_EMBED_TEMPLATE.add_field(
+    name="🎯 __General Actions__",
+    value=_GENERAL_ACTIONS_TEXT,
+    inline=False
+)
+
+_ACTIONS_EMBED_TEMPLATE.add_field(
+    name="🃏 __Character Actions__",
+    value=_CHARACTER_ACTIONS_TEXT,
+    inline=False
+)
+
+_ACTIONS_EMBED_TEMPLATE.add_field(
+    name="🛡️ __Defensive Actions__",
+    value=_DEFENSIVE_ACTIONS_TEXT,
+    inline=False
+)
+
+# Add the Coup actions reference image
+_ACTIONS_EMBED_TEMPLATE.set_image(url="https://static.wikia.nocookie.net/board-games-galore/images/2/2d/Coup_actions.jpg/revision/latest?cb=20160713201921")
+
+# Generic footer
+_ACTIONS_EMBED_TEMPLATE.set_footer(
+    text="🎭 Master the art of deception • Bluff, challenge, and dominate!",
+    icon_url="https://cdn.discordapp.com/emojis/755774680816632987.png"
+)
 
-    # Generic footer
-    embed.set_footer(
-        text="🎭 Master the art of deception • Bluff, challenge, and dominate!",
-        icon_url="https://cdn.discordapp.com/emojis/755774680816632987.png"
-    )
-    
-    # Add timestamp
-    import datetime
-    embed.timestamp = datetime.datetime.now()
+@bot.command(name="actions")
+async def actions(ctx):
+    """Display all available actions with enhanced styling."""
+    # Only the timestamp changes between calls
+    embed = _ACTIONS_EMBED_TEMPLATE.copy()
+    embed.timestamp = datetime.now()
     
     await ctx.send(embed=embed)
 
@@ -2290,66 +2679,78 @@ async def actions(ctx):
 async def cards(ctx):
     """Display the cards in your hand via a direct message."""
     game_state = get_game_state(ctx.guild.id)
+    me = game_state.players.get(ctx.author.id)
     
-    if ctx.author not in game_state['players']:
+    if me is None:
         await send_error(ctx, "🚫 Not in Game", "You are not part of the current game.")
         return
 
-    if not is_player_alive(ctx.guild.id, ctx.author):
+    if not game_state.alive.get(ctx.author.id):
         await send_error(ctx, "💀 Out of the Game", "You are out of the game and have no cards.")
         return
 
     try:
-        cards_message = f"Your cards are: {', '.join(game_state['players'][ctx.author]['cards'])}."
+        cards_message = f"Your cards are: {', '.join(me.cards)}."
         await ctx.author.send(cards_message)
         await send_success(ctx, "📬 Cards Sent", f"{ctx.author.name}, I've sent you a DM with your cards!")
     except discord.Forbidden:
         await send_error(ctx, "🚫 DM Disabled", 
                         f"{ctx.author.name}, I couldn't send you a DM. Please enable DMs to view your cards.")
 
+# Current player's action hint for !table, highest coin threshold first
+_COIN_HINTS = (
+    (10, "🚨 **Must use `!coup <target>`**"),
+    (7, "💥 Can coup with `!coup <target>`"),
+    (3, "🗡️ Can assassinate with `!assassinate <target>`"),
+)
+_DEFAULT_HINT = "💡 Use `!actions` for available moves"
+
 @bot.command(name="table")
 async def table(ctx):
     """Displays a beautiful, detailed table showing game state."""
     game_state = get_game_state(ctx.guild.id)
+    players = game_state.players
+    current_player = game_state.current_player
+    alive = game_state.alive
     
-    if not game_state['players']:
+    if not players:
         await send_error(ctx, "🚫 No Players", "No players are currently in the game.")
         return
 
     # Create turn-ordered player list starting with current player
-    if game_state['current_player']:
-        player_list = list(game_state['players'].keys())
-        current_index = player_list.index(game_state['current_player'])
-        ordered_players = player_list[current_index:] + player_list[:current_index]
+    if current_player and current_player.id in players:
+        # turn_index already points at the current seat; only fall back to a scan if it doesn't
+        turn_order = game_state.turn_order
+        current_index = game_state.turn_index
+        if turn_order[current_index] != current_player:
+            current_index = turn_order.index(current_player)
+        ordered_players = [player for player in turn_order[current_index:] + turn_order[:current_index]
+                           if player.id in players]
     else:
-        ordered_players = list(game_state['players'].keys())
+        ordered_players = [seat.member for seat in players.values()]
 
     # Enhanced player display with better formatting
-    player_info = ""
-    alive_count = 0
+    player_lines = []
     
     for i, player in enumerate(ordered_players, 1):
-        data = game_state['players'][player]
+        data = players[player.id]
         
         # Enhanced status indicators with descriptions
-        if player == game_state['current_player']:
+        if player == current_player:
             status = "👑 **CURRENT TURN**"
             status_color = "🟡"
-        elif not is_player_alive(ctx.guild.id, player):
+        elif not alive.get(player.id):
             status = "💀 *Eliminated*"
             status_color = "🔴"
         else:
             status = ""  # No status for waiting players
             status_color = "🟢"
         
-        if is_player_alive(ctx.guild.id, player):
-            alive_count += 1
-        
         # Beautiful player entry with visual hierarchy
-        player_info += f"**{i}.** {status_color} **{player.name}**\n"
+        player_lines.append(f"**{i}.** {status_color} **{player.name}**")
         if status:  # Only show status line if there's a status
-            player_info += f"     └ {status}\n"
-        player_info += f"     └ 💰 **{data['coins']}** coins │ 🃏 **{len(data['cards'])}** cards\n\n"
+            player_lines.append(f"     └ {status}")
+        player_lines.append(f"     └ 💰 **{data.coins}** coins │ 🃏 **{len(data.cards)}** cards\n")
 
     # Create the main embed with enhanced styling
     embed = discord.Embed(
@@ -2359,10 +2760,10 @@ async def table(ctx):
     )
     
     # Game status header
-    game_status = f"🔥 **{alive_count}** players remaining\n"
-    if game_state['current_player']:
-        game_status += f"🎯 **{game_state['current_player'].name}**'s turn"
-        if game_state['players'][game_state['current_player']]['coins'] >= 10:
+    game_status = f"🔥 **{game_state.alive_count}** players remaining\n"
+    if current_player:
+        game_status += f"🎯 **{current_player.name}**'s turn"
+        if players[current_player.id].coins >= 10:
             game_status += " *(MUST COUP!)*"
     
     embed.add_field(
@@ -2374,28 +2775,17 @@ async def table(ctx):
     # Player information with beautiful formatting
     embed.add_field(
         name="👥 Players (Turn Order)",
-        value=player_info.strip(),
+        value="\n".join(player_lines).strip(),
         inline=False
     )
     
     # Enhanced discard pile with visual formatting
-    if game_state['discarded_cards']:
-        card_counts = {}
-        for card in game_state['discarded_cards']:
-            card_counts[card] = card_counts.get(card, 0) + 1
-        
-        # Create visual card display with emojis
-        card_emojis = {
-            "Duke": "👑",
-            "Assassin": "🗡️", 
-            "Captain": "⚓",
-            "Ambassador": "🤝",
-            "Contessa": "🛡️"
-        }
+    if game_state.discarded_cards:
+        card_counts = Counter(game_state.discarded_cards)
         
         discard_lines = []
         for card, count in sorted(card_counts.items()):
-            emoji = card_emojis.get(card, "🃏")
+            emoji = CARD_EMOJIS.get(card, "🃏")
             discard_lines.append(f"{emoji} **{card}** ×{count}")
         
         discard_text = "\n".join(discard_lines)
@@ -2412,8 +2802,9 @@ async def table(ctx):
         )
 
     # Enhanced deck information
-    deck_info = f"📚 **{len(game_state['court_deck'])}** cards"
-    if len(game_state['court_deck']) <= 5:
+    deck_size = len(game_state.court_deck)
+    deck_info = f"📚 **{deck_size}** cards"
+    if deck_size <= 5:
         deck_info += "\n⚠️ *Deck running low!*"
     
     embed.add_field(
@@ -2423,15 +2814,9 @@ async def table(ctx):
     )
     
     # Add action hints for current player
-    if game_state['current_player'] and is_player_alive(ctx.guild.id, game_state['current_player']):
-        if game_state['players'][game_state['current_player']]['coins'] >= 10:
-            action_hint = "🚨 **Must use `!coup <target>`**"
-        elif game_state['players'][game_state['current_player']]['coins'] >= 7:
-            action_hint = "💥 Can coup with `!coup <target>`"
-        elif game_state['players'][game_state['current_player']]['coins'] >= 3:
-            action_hint = "🗡️ Can assassinate with `!assassinate <target>`"
-        else:
-            action_hint = "💡 Use `!actions` for available moves"
+    if current_player and alive.get(current_player.id):
+        coins = players[current_player.id].coins
+        action_hint = next((hint for threshold, hint in _COIN_HINTS if coins >= threshold), _DEFAULT_HINT)
         
         embed.add_field(
             name="🎯 Current Player Actions",
@@ -2441,17 +2826,15 @@ async def table(ctx):
     
     # Beautiful footer with turn information
     if len(ordered_players) > 1:
-        next_player_index = 1 if len(ordered_players) > 1 else 0
-        next_player = ordered_players[next_player_index] if len(ordered_players) > 1 else ordered_players[0]
-        if is_player_alive(ctx.guild.id, next_player):
+        next_player = ordered_players[1]
+        if alive.get(next_player.id):
             embed.set_footer(
                 text=f"⏭️ Next turn: {next_player.name} • Use !actions to see available moves",
                 icon_url="https://cdn.discordapp.com/emojis/755774680816632987.png"
             )
     
     # Add timestamp
-    import datetime
-    embed.timestamp = datetime.datetime.now()
+    embed.timestamp = datetime.now()
     
     await ctx.send(embed=embed)
 
@@ -2460,13 +2843,13 @@ async def table(ctx):
 @bot.command(name="coins")
 async def coins(ctx):
     """Displays the number of coins the invoking player currently has."""
-    game_state = get_game_state(ctx.guild.id)
+    me = get_game_state(ctx.guild.id).players.get(ctx.author.id)
     
-    if ctx.author not in game_state['players']:
+    if me is None:
         await send_error(ctx, "🚫 Not in Game", "You are not currently in the game.")
         return
 
-    num_coins = game_state['players'][ctx.author]["coins"]
+    num_coins = me.coins
     await send_embed(ctx, "💰 Your Coins",
                     f"{ctx.author.name}, you currently have **{num_coins}** coins.",
                     discord.Color.green())
@@ -2476,14 +2859,14 @@ async def coins(ctx):
 #     print(f"DEBUG: Stats command called with target='{target}'")  # ADD THIS
 #     """Display server or player statistics."""
 #     game_state = get_game_state(ctx.guild.id)
-#     stats = game_state['stats']
+#     stats = game_state.stats
     
 #     if target is None:
 #         # Show server stats
-#         total_games = stats['games_started']
-#         completed_games = stats['games_completed']
-#         abandoned_games = stats['games_abandoned']
-#         total_players = len(stats['total_participants'])
+#         total_games = stats.games_started
+#         completed_games = stats.games_completed
+#         abandoned_games = stats.games_abandoned
+#         total_players = len(stats.total_participants)
         
 #         completion_rate = (completed_games / total_games * 100) if total_games > 0 else 0
         
@@ -2502,12 +2885,12 @@ async def coins(ctx):
 #         )
         
 #         # Top 3 players by wins
-#         if stats['player_wins']:
-#             sorted_winners = sorted(stats['player_wins'].items(), key=lambda x: x[1], reverse=True)[:3]
+#         if stats.player_wins:
+#             sorted_winners = sorted(stats.player_wins.items(), key=lambda x: x[1], reverse=True)[:3]
 #             top_players = []
 #             for player_id, wins in sorted_winners:
 #                 if player := bot.get_user(player_id):
-#                     games_played = stats['player_games'].get(player_id, 0)
+#                     games_played = stats.player_games.get(player_id, 0)
 #                     win_rate = (wins / games_played * 100) if games_played > 0 else 0
 #                     top_players.append(f"**{player.name}:** {wins} wins ({win_rate:.1f}%)")
             
@@ -2560,8 +2943,8 @@ async def coins(ctx):
 #         player_id = target_player.id
         
 #         # Get player's stats
-#         games_played = stats['player_games'].get(player_id, 0)
-#         games_won = stats['player_wins'].get(player_id, 0)
+#         games_played = stats.player_games.get(player_id, 0)
+#         games_won = stats.player_wins.get(player_id, 0)
         
 #         if games_played == 0:
 #             await send_info(ctx, f"👤 {target_player.name}'s Stats", 
@@ -2573,7 +2956,7 @@ async def coins(ctx):
 #         games_lost = games_played - games_won
         
 #         # Calculate rank among all players
-#         all_players_by_wins = sorted(stats['player_wins'].items(), key=lambda x: x[1], reverse=True)
+#         all_players_by_wins = sorted(stats.player_wins.items(), key=lambda x: x[1], reverse=True)
 #         player_rank = None
 #         for i, (pid, wins) in enumerate(all_players_by_wins, 1):
 #             if pid == player_id:
@@ -2581,11 +2964,11 @@ async def coins(ctx):
 #                 break
         
 #         if player_rank is None:
-#             player_rank = len(stats['player_wins']) + 1
+#             player_rank = len(stats.player_wins) + 1
         
 #         # Calculate rank among all players by win rate (for players with 2+ games)
-#         experienced_players = [(pid, stats['player_wins'].get(pid, 0) / stats['player_games'].get(pid, 1) * 100) 
-#                             for pid in stats['player_games'] if stats['player_games'][pid] >= 2]
+#         experienced_players = [(pid, stats.player_wins.get(pid, 0) / stats.player_games.get(pid, 1) * 100) 
+#                             for pid in stats.player_games if stats.player_games[pid] >= 2]
 #         experienced_players.sort(key=lambda x: x[1], reverse=True)
         
 #         win_rate_rank = None
@@ -2617,7 +3000,7 @@ async def coins(ctx):
 #         )
         
 #         # Rankings
-#         rank_text = f"**Overall Rank:** #{player_rank} of {len(stats['total_participants'])}"
+#         rank_text = f"**Overall Rank:** #{player_rank} of {len(stats.total_participants)}"
 #         if win_rate_rank and games_played >= 2:
 #             rank_text += f"\n**Win Rate Rank:** #{win_rate_rank} of {len(experienced_players)}"
 #             rank_text += f"\n*(Players with 2+ games)*"
@@ -2634,114 +3017,221 @@ async def coins(ctx):
 #         log_game_action("player_stats_viewed", ctx.guild.id, ctx.author, target_player, f"Viewed {target_player.name}'s stats")
 
 # Error Handlers
+# Static error replies, built once: {(command name or None for any, error kind): embed}
+_ERROR_EMBEDS = {
+    key: create_embed(title, description, discord.Color.red())
+    for key, (title, description) in {
+        ("assassinate", "MissingRequiredArgument"): (
+            "🗡️ Missing Assassination Target",
+            "You need to specify who to assassinate!\n"
+            "**Usage:** `!assassinate @player` or `!assassinate PlayerName`\n"
+            "**Example:** `!assassinate @Alice`"),
+        ("steal", "MissingRequiredArgument"): (
+            "💰 Missing Steal Target",
+            "You need to specify who to steal from!\n"
+            "**Usage:** `!steal @player` or `!steal PlayerName`\n"
+            "**Example:** `!steal @Bob`"),
+        ("coup", "MissingRequiredArgument"): (
+            "💥 Missing Coup Target",
+            "You need to specify who to coup!\n"
+            "**Usage:** `!coup @player` or `!coup PlayerName`\n"
+            "**Example:** `!coup @Charlie`"),
+        (None, "BadArgument"): (
+            "🚫 Invalid Argument",
+            "There was an issue with your command arguments.\n"
+            "Use `!actions` for help with command usage."),
+        (None, "unexpected"): (
+            "⚠️ Command Error",
+            "Something unexpected went wrong with that command. Please try again.\n"
+            "If this keeps happening, contact an admin."),
+    }.items()
+}
+
+# Per-command MissingRequiredArgument replies, keyed by the bare (interned) command name so
+# the lookup skips building a tuple key and compares the names by identity
+_MISSING_ARG_EMBEDS = {
+    sys.intern(cmd_name): embed
+    for (cmd_name, kind), embed in _ERROR_EMBEDS.items()
+    if kind == "MissingRequiredArgument"
+}
+
+# At most one error reply per user every 3 seconds; repeat replies inside the window are dropped
+_ERROR_COOLDOWN = commands.CooldownMapping.from_cooldown(1, 3.0, commands.BucketType.user)
+
+# MemberNotFound reply body; only the typed name and the command vary
+_MEMBER_NOT_FOUND_TEMPLATE = (
+    "I couldn't find a player named `{arg}` to {cmd}.\n\n"
+    "**How to target players:**\n"
+    "• `!{cmd} @PlayerName` (mention them)\n"
+    "• `!{cmd} PlayerName` (exact username)\n"
+    "• `!{cmd} Display Name` (their server nickname)\n\n"
+    "**Make sure:**\n"
+    "• They're in this Discord server\n"
+    "• They're part of the current game\n"
+    "• You spelled their name correctly"
+)
+
+def _error_reply_allowed(ctx):
+    """Take one reply from the user's _ERROR_COOLDOWN budget; only the replies are throttled, never logging."""
+    return not _ERROR_COOLDOWN.get_bucket(ctx.message).update_rate_limit()
+
+async def _handle_member_not_found(ctx, error):
+    """Invalid target - applies to assassinate, steal, coup."""
+    if not _error_reply_allowed(ctx):
+        return
+    cmd_name = ctx.command.name
+    emoji = TARGETED_ACTION_EMOJIS.get(cmd_name, "🚫")
+    action = cmd_name.title()
+    
+    await send_error(ctx, f"{emoji} {action} Target Not Found",
+                    _MEMBER_NOT_FOUND_TEMPLATE.format(arg=error.argument, cmd=cmd_name))
+
+@functools.lru_cache(maxsize=32)
+def _missing_argument_embed(cmd_name):
+    """A command's MissingRequiredArgument reply: its tailored one, else the generic one built once."""
+    embed = _MISSING_ARG_EMBEDS.get(cmd_name)
+    if embed is None:
+        embed = create_embed("🚫 Missing Arguments",
+                             f"The `!{cmd_name}` command requires additional arguments.\n"
+                             "Use `!actions` to see all available commands.",
+                             discord.Color.red())
+    return embed
+
+async def _handle_missing_argument(ctx, error):
+    """User forgot to provide arguments."""
+    if _error_reply_allowed(ctx):
+        await send_error_embed(ctx, _missing_argument_embed(ctx.command.name))
+
+async def _handle_bad_argument(ctx, error):
+    """Other argument conversion errors."""
+    if _error_reply_allowed(ctx):
+        await send_error_embed(ctx, _ERROR_EMBEDS[(None, "BadArgument")])
+
+async def _handle_unexpected_error(ctx, error):
+    """Anything else: log it with its traceback and give a generic reply."""
+    # %s args plus exc_info; the QueueHandler formats the message and traceback here in the
+    # caller before queuing, and only the file/console writes happen on the listener thread
+    logger.error("[%s] COMMAND_ERROR: Unexpected error in command '%s': %s: %s",
+                 ctx.guild.name if ctx.guild else 'DM', ctx.command, type(error).__name__, error,
+                 exc_info=error)
+    if _error_reply_allowed(ctx):
+        await send_error_embed(ctx, _ERROR_EMBEDS[(None, "unexpected")])
+
+_ERROR_HANDLERS = {
+    commands.MemberNotFound: _handle_member_not_found,
+    commands.MissingRequiredArgument: _handle_missing_argument,
+    commands.BadArgument: _handle_bad_argument,
+}
+
+@functools.lru_cache(maxsize=64)
+def _error_handler_for(error_type):
+    """Closest handler in error_type's MRO, so e.g. other BadArgument subclasses still match."""
+    return next((_ERROR_HANDLERS[cls] for cls in error_type.__mro__ if cls in _ERROR_HANDLERS), _handle_unexpected_error)
+
 @bot.event
 async def on_command_error(ctx, error):
     """Handle command errors gracefully for all commands."""
     
-    if isinstance(error, commands.MemberNotFound):
-        # Handle when user provides invalid target - applies to assassinate, steal, coup
-        command_emojis = {
-            "assassinate": "🗡️",
-            "steal": "💰", 
-            "coup": "💥"
-        }
-        
-        emoji = command_emojis.get(ctx.command.name, "🚫")
-        action = ctx.command.name.title()
-        
-        await send_error(ctx, f"{emoji} {action} Target Not Found", 
-                        f"I couldn't find a player named `{error.argument}` to {ctx.command.name}.\n\n"
-                        "**How to target players:**\n"
-                        f"• `!{ctx.command.name} @PlayerName` (mention them)\n"
-                        f"• `!{ctx.command.name} PlayerName` (exact username)\n"
-                        f"• `!{ctx.command.name} Display Name` (their server nickname)\n\n"
-                        "**Make sure:**\n"
-                        "• They're in this Discord server\n"
-                        "• They're part of the current game\n"
-                        "• You spelled their name correctly")
-        return
-    
-    elif isinstance(error, commands.MissingRequiredArgument):
-        # Handle when user forgets to provide arguments
-        if ctx.command.name == 'assassinate':
-            await send_error(ctx, "🗡️ Missing Assassination Target", 
-                           "You need to specify who to assassinate!\n"
-                           "**Usage:** `!assassinate @player` or `!assassinate PlayerName`\n"
-                           "**Example:** `!assassinate @Alice`")
-        elif ctx.command.name == 'steal':
-            await send_error(ctx, "💰 Missing Steal Target", 
-                           "You need to specify who to steal from!\n"
-                           "**Usage:** `!steal @player` or `!steal PlayerName`\n"
-                           "**Example:** `!steal @Bob`")
-        elif ctx.command.name == 'coup':
-            await send_error(ctx, "💥 Missing Coup Target", 
-                           "You need to specify who to coup!\n"
-                           "**Usage:** `!coup @player` or `!coup PlayerName`\n"
-                           "**Example:** `!coup @Charlie`")
-        else:
-            await send_error(ctx, "🚫 Missing Arguments", 
-                           f"The `!{ctx.command.name}` command requires additional arguments.\n"
-                           "Use `!actions` to see all available commands.")
-        return
-    
-    elif isinstance(error, commands.CommandNotFound):
-        # Ignore unknown commands (don't spam chat with errors)
+    # Typos are the most common error by far: ignore them before any other work
+    # (they send nothing, so they also don't use up the user's reply budget)
+    error_type = type(error)
+    if error_type is commands.CommandNotFound:  # discord.py raises exactly this class, never a subclass
         return
     
-    elif isinstance(error, commands.BadArgument):
-        # Handle other argument conversion errors
-        await send_error(ctx, "🚫 Invalid Argument", 
-                        f"There was an issue with your command arguments.\n"
-                        f"Use `!actions` for help with command usage.")
-        return
-    
-    else:
-        # For other unexpected errors, log to console for debugging
-        print(f"Unexpected error in command '{ctx.command}': {type(error).__name__}: {error}")
-        await send_error(ctx, "⚠️ Command Error", 
-                        "Something unexpected went wrong with that command. Please try again.\n"
-                        "If this keeps happening, contact an admin.")
+    # Handlers apply the per-user reply cooldown themselves, after any logging
+    await _error_handler_for(error_type)(ctx, error)
+
+# "• name: N cards" lines per debug_cards field; 20 of the longest (32-char) names fit in 1024 chars
+DEBUG_LINES_PER_FIELD = 20
+# Characters of breakdown lines per debug_cards embed, leaving room for the rest within Discord's 6000 total
+DEBUG_BREAKDOWN_BUDGET = 4000
 
 # Debug command to check card counts
 @bot.command(name="debug_cards")
 async def debug_cards(ctx):
     """Debug command to check card distribution."""
-    game_state = get_game_state(ctx.guild.id)
+    if ctx.guild is None:
+        await send_error(ctx, "🚫 Server Only", "Run this in a server.")
+        return
+    
+    # Plain lookup: inspecting must not create a game, start cleanup or push back expiry
+    game_state = games.get(ctx.guild.id)
     
-    if not game_state['game_started']:
+    if game_state is None or not game_state.game_started:
         await send_error(ctx, "🚫 No Game", "No game in progress.")
         return
     
-    total_player_cards = sum(len(game_state['players'][player]["cards"]) for player in game_state['players'])
-    deck_cards = len(game_state['court_deck'])
-    discarded_count = len(game_state['discarded_cards'])
+    # One pass over the seats feeds both the total and the breakdown; every seat is
+    # counted, but lines stop being formatted once the breakdown budget is spent
+    total_player_cards = 0
+    player_lines = []
+    budget = DEBUG_BREAKDOWN_BUDGET
+    hidden = 0
+    for seat in game_state.players.values():
+        count = len(seat.cards)
+        total_player_cards += count
+        if hidden:
+            hidden += 1
+            continue
+        line = f"• {seat.member.name}: {count} cards"
+        if len(line) >= budget:
+            hidden = 1
+            continue
+        budget -= len(line) + 1  # +1 for the joining newline
+        player_lines.append(line)
+    if hidden:
+        player_lines.append(f"… (+{hidden} more)")
+    deck_cards = len(game_state.court_deck)
+    discarded_count = len(game_state.discarded_cards)
     total_cards = total_player_cards + deck_cards + discarded_count
     
-    debug_info = f"**Card Distribution:**\n"
-    debug_info += f"👥 Players have: **{total_player_cards}** cards\n"
-    debug_info += f"📚 Deck has: **{deck_cards}** cards\n"
-    debug_info += f"🗑️ Discarded: **{discarded_count}** cards\n"
-    debug_info += f"🎯 Total: **{total_cards}** cards (should be 15)\n\n"
-    
-    debug_info += f"**Player breakdown:**\n"
-    for player in game_state['players']:
-        debug_info += f"• {player.name}: {len(game_state['players'][player]['cards'])} cards\n"
-    
-    if game_state['discarded_cards']:
-        debug_info += f"\n**Discarded cards:** {', '.join(game_state['discarded_cards'])}"
-    
-    await send_embed(ctx, "🔍 Card Count Debug", debug_info, discord.Color.orange())
-
-# Load environment variables
-load_dotenv()
-
-# Get token from environment variable
-TOKEN = os.getenv('BOT_TOKEN')
-
-if not TOKEN:
-    print("❌ ERROR: BOT_TOKEN not found in environment variables!")
-    print("Make sure you have a .env file with BOT_TOKEN=your_token_here")
-    exit(1)
-
-print("✅ Bot token loaded successfully")
-bot.run(TOKEN)
\ No newline at end of file
+    parts = [
+        "**Card Distribution:**",
+        f"👥 Players have: **{total_player_cards}** cards",
+        f"📚 Deck has: **{deck_cards}** cards",
+        f"🗑️ Discarded: **{discarded_count}** cards",
+        f"🎯 Total: **{total_cards}** cards (should be 15)",
+    ]
+    
+    if game_state.discarded_cards:
+        parts.append(f"\n**Discarded cards:** {', '.join(game_state.discarded_cards)}")
+    
+    debug_info = "\n".join(parts)
+    
+    # Player breakdown as fields of DEBUG_LINES_PER_FIELD lines each (1024-char field limit)
+    fields = [
+        {
+            "name": "👥 Player breakdown" if i == 0 else "👥 Player breakdown (cont.)",
+            "value": "\n".join(player_lines[i:i + DEBUG_LINES_PER_FIELD]),
+            "inline": False,
+        }
+        for i in range(0, len(player_lines), DEBUG_LINES_PER_FIELD)
+    ]
+    
+    await send_embed(ctx, "🔍 Card Count Debug", debug_info, discord.Color.orange(), fields=fields)
+
+async def main():
+    """Log in and hold the gateway connection until the bot is closed."""
+    async with bot:
+        await bot.start(TOKEN)
+
+# uvloop is optional: a faster drop-in event loop for the websocket/HTTP-bound workload
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+else:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+# bot.start skips bot.run's default handler for discord.py's own log records, so add it here
+discord.utils.setup_logging(root=False)
+
+try:
+    asyncio.run(main())
+except KeyboardInterrupt:
+    pass  # Same as bot.run: Ctrl+C is a normal shutdown
+finally:
+    # Flush buffered actions, stats and any queued log records before the process exits
+    flush_action_buffer()
+    flush_stats_buffer()
+    logger._listener.stop()
\ No newline at end of file